@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the APT Packages parser of reload-ext.py against the original regex parser.
+Generates a synthetic Packages file, checks both parsers agree, and reports timings.
+
+    python bin/bench-apt.py --stanzas 100000
+"""
+
+import argparse
+import gc
+import hashlib
+import importlib.util
+import json
+import re
+import time
+from collections import deque
+from pathlib import Path
+
+
+def load_reload_ext():
+    """Import bin/reload-ext.py (not a valid module name)"""
+    spec = importlib.util.spec_from_file_location('reload_ext', Path(__file__).parent / 'reload-ext.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_packages_file(stanzas):
+    """Build a synthetic Packages file, with multi-line descriptions and non-column fields"""
+    parts = []
+    for i in range(stanzas):
+        pg = 13 + i % 6
+        name = f"postgresql-{pg}-pgext{i % 700}"
+        parts.append(
+            f"Package: {name}\n"
+            f"Source: pgext{i % 700}\n"
+            f"Version: {i % 7}.{i % 11}.{i % 3}-1.pgdg120+{1 + i % 2}\n"
+            f"Architecture: {'amd64' if i % 2 else 'arm64'}\n"
+            f"Maintainer: Debian PostgreSQL Maintainers <team+postgresql@tracker.debian.org>\n"
+            f"Installed-Size: {'' if i % 97 == 0 else 100 + i % 900}\n"
+            f"Depends: libc6 (>= 2.34), postgresql-{pg}, postgresql-{pg}-jit-llvm (>= 15)\n"
+            f"Breaks: postgresql-{pg}-pgext{i % 700} (<< 1.0)\n"
+            f"Homepage: https://github.com/pgext/pgext{i % 700}\n"
+            f"Priority: optional\n"
+            f"Section: database\n"
+            f"Filename: pool/main/p/pgext{i % 700}/{name}_{i}_amd64.deb\n"
+            f"Size: {40000 + i}\n"
+            f"MD5sum: {hashlib.md5(str(i).encode()).hexdigest()}\n"
+            f"SHA1: {hashlib.sha1(str(i).encode()).hexdigest()}\n"
+            f"SHA256: {hashlib.sha256(str(i).encode()).hexdigest()}\n"
+            f"Description: synthetic extension {i}\n"
+            f" This is the long description of the synthetic extension,\n"
+            f" spread over several continuation lines.\n"
+            f" .\n"
+            f" It mimics the apt.postgresql.org Packages layout.\n"
+            f"Description-md5: {hashlib.md5(name.encode()).hexdigest()}\n"
+            f"Multi-Arch: same\n"
+        )
+    return '\n'.join(parts).encode()
+
+
+def legacy_parse_apt_data(packages_content):
+    """The original regex based parser (str in, list of rows with extra as a JSON string out)"""
+    fixed_fields = [
+        'Package', 'Version', 'Architecture', 'Size', 'Installed-Size', 'Priority', 'Section', 'Filename', 
+        'SHA256', 'SHA1', 'MD5sum', 'Maintainer', 'Homepage', 'Depends', 'Source', 'Provides', 
+        'Recommends', 'Suggests', 'Conflicts', 'Breaks', 'Replaces', "Enhances", "Pre-Depends", 
+        'Build-Ids', 'Package-Type', 'Auto-Built-Package', 'Multi-Arch', 'Description'
+    ]
+    
+    def parse_package_record(record):
+        package_info = {}
+        current_key = None
+        
+        for line in record.split('\n'):
+            if not line.strip():
+                continue
+            if line[0] != ' ':
+                match = re.match(r'^(.*?):\s*(.*)', line.strip())
+                if match:
+                    key, value = match.groups()
+                    key = key.strip()
+                    value = value.strip()
+                    current_key = key
+                    
+                    if key == 'Installed-Size':
+                        if not value or value == '':
+                            value = 0
+                        else:
+                            try:
+                                value = int(value) * 1024  # Convert KB to bytes
+                            except ValueError:
+                                value = 0
+                    elif key in ['Size']:
+                        try:
+                            value = int(value)
+                        except ValueError:
+                            value = 0
+                    
+                    if key == 'Description':
+                        package_info[key] = [value]
+                    else:
+                        package_info[key] = value
+            elif current_key == 'Description':
+                package_info[current_key].append(line.strip())
+        
+        if 'Description' in package_info:
+            description = "\n".join(package_info['Description'])
+            package_info['Description'] = description
+        
+        fixed_values = tuple(package_info.get(field, '') for field in fixed_fields)
+        other_fields = {key: value for key, value in package_info.items()
+                       if key not in fixed_fields}
+        other_fields_json = json.dumps(other_fields)
+        return fixed_values + (other_fields_json,)
+    
+    records = packages_content.split('\n\n')
+    parsed_packages = []
+    
+    for record in records:
+        if record.strip():
+            package = parse_package_record(record)
+            # Fix empty size values
+            package = list(package)
+            if package[4] == '':  # Installed-Size
+                package[4] = 0
+            parsed_packages.append(tuple(package))
+    
+    return parsed_packages
+
+
+
+def normalize_legacy(row):
+    """Align a legacy row with the new parser output: extra as dict, missing Size as NULL"""
+    row = list(row)
+    row[3] = None if row[3] == '' else row[3]
+    row[-1] = json.loads(row[-1])
+    return tuple(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark APT Packages parsers")
+    parser.add_argument('--stanzas', type=int, default=100000, help="number of packages in the synthetic file")
+    parser.add_argument('--rounds', type=int, default=3, help="best of N rounds")
+    args = parser.parse_args()
+
+    reload_ext = load_reload_ext()
+    data = build_packages_file(args.stanzas)
+    print(f"Synthetic Packages file: {args.stanzas} stanzas, {len(data)} bytes")
+
+    new_rows = list(reload_ext.parse_apt_data(data))
+    old_rows = [normalize_legacy(row) for row in legacy_parse_apt_data(data.decode('utf-8'))]
+    if new_rows != old_rows:
+        mismatch = next(i for i, (a, b) in enumerate(zip(new_rows, old_rows)) if a != b) if len(new_rows) == len(old_rows) else None
+        raise SystemExit(f"parsers disagree ({len(new_rows)} vs {len(old_rows)} rows, first mismatch at {mismatch})")
+    print(f"Both parsers agree on {len(new_rows)} rows")
+    del new_rows, old_rows  # keep the heap small, or GC passes skew the timings
+
+    timings = {}
+    # Consume each parser the way reload-ext used it: the legacy one returned a full list,
+    # the current one is streamed straight into COPY
+    for name, parse in (('legacy', lambda: legacy_parse_apt_data(data.decode('utf-8'))),
+                        ('current', lambda: deque(reload_ext.parse_apt_data(data), maxlen=0))):
+        gc.collect()
+        best = None
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            parse()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+        print(f"{name:<8} {best:8.3f}s  {args.stanzas / best:12.0f} stanzas/s")
+    print(f"speedup  {timings['legacy'] / timings['current']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
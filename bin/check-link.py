@@ -3,12 +3,45 @@
 import os
 import re
 import glob
-from typing import Dict, List, Set, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, List, Set
 from urllib.parse import urlparse, urljoin
-from pathlib import Path
 from dataclasses import dataclass
 
 
+# Patterns run over a whole file buffer, link patterns never cross a line break
+MARKDOWN_LINK_PATTERN = re.compile(r'(?=[!\[])(?:!\[[^\]\n]*\]\([^)\n]+\)|(?<!!)\[([^\]\n]*)\]\(([^)\n]+)\))')  # images are skipped
+HTML_LINK_PATTERN = re.compile(r'href=["\']([^"\'\n]+)["\']')
+HEADER_PATTERN = re.compile(r'^#{1,6}\s+(.+?)(?:\s*{[^}]*})?\s*$', re.MULTILINE)
+HEADER_ID_PATTERN = re.compile(r'\s*{#[^}]*}\s*$')
+MANUAL_ANCHOR_PATTERN = re.compile(r'\[#([^\]]+)\]')
+HTML_ID_PATTERN = re.compile(r'id=["\']([^"\']+)["\']')
+NEWLINE_PATTERN = re.compile(r'\n')
+
+# Header text to anchor rules, applied in order, after these special cases for programming languages
+ANCHOR_SPECIAL_CASES = {'C++': 'c-1', 'C#': 'c-2', 'F#': 'f-sharp', '.NET': 'net'}
+ANCHOR_RULES = [
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),  # markdown links [text](url), keep the text
+    (re.compile(r'`([^`]*)`'), r'\1'),  # backticks, keep the content
+    (re.compile(r'[*{}]'), ''),  # bold, italic, braces, but keep underscores
+    (re.compile(r'[\[\]()]'), ''),  # remaining brackets and parentheses
+    (re.compile(r'<[^>]+>'), ''),  # HTML tags
+]
+ANCHOR_PUNCTUATION = re.compile(r'[^\w\s-]')  # applied after lowercasing, keeps pg_stat_statements intact
+ANCHOR_SPACES = re.compile(r'\s+')
+ANCHOR_HYPHENS = re.compile(r'-+')
+
+# Fuma Docs routing, applied in order to '/' + the content relative path without .mdx / .zh.mdx:
+#   content/docs/index.mdx -> /, content/docs/{docs,ext,pgsql,...}/* -> /*, content/stub/* -> /stub/*
+#   (name) folders are omitted from the URL, index pages map to their folder, .zh.mdx get the /zh prefix
+ROUTE_RULES = [
+    (re.compile(r'^/docs/'), '/'),
+    (re.compile(r'/\([^)]+\)'), ''),
+    (re.compile(r'/index$'), '/'),
+]
+
+
 @dataclass
 class LinkReference:
     """Represents a link reference found in a file."""
@@ -35,14 +68,10 @@ class FumaDocsLinkChecker:
         self.file_to_url_map: Dict[str, str] = {}  # file path -> URL
         self.url_to_file_map: Dict[str, str] = {}  # URL -> file path
         self.file_anchors: Dict[str, Set[str]] = {}  # file path -> set of anchors
+        self.file_links: Dict[str, List[LinkReference]] = {}  # file path -> internal links, in line order
         self.all_links: List[LinkReference] = []
         self.dead_links: List[DeadLink] = []
-        
-        # Regex patterns for extracting links
-        self.markdown_link_pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)|(?<!!)\[([^\]]*)\]\(([^)]+)\)')
-        self.html_link_pattern = re.compile(r'href=["\']([^"\']+)["\']')
-        self.anchor_pattern = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
-        self.manual_anchor_pattern = re.compile(r'\[#([^\]]+)\]')
+        self.resolved_urls: Dict = {}  # link URL, or (page URL, relative link URL) -> resolved URL
     
     def build_file_index(self):
         """Build index of all MDX files and their corresponding URLs."""
@@ -56,8 +85,8 @@ class FumaDocsLinkChecker:
             self.file_to_url_map[file_path] = url
             self.url_to_file_map[url] = file_path
             
-            # Extract anchors from this file
-            self._extract_anchors(file_path)
+            # Extract anchors and links from this file in one read
+            self._scan_file(file_path)
         
         # Also add dynamic extension pages from data/extensions/
         self._add_dynamic_extension_pages()
@@ -67,109 +96,15 @@ class FumaDocsLinkChecker:
     
     def _file_path_to_url(self, file_path: str) -> str:
         """Convert file path to URL according to Fuma Docs routing rules."""
-        # Remove content/ prefix and .mdx suffix
-        relative_path = file_path.replace(self.content_dir + "/", "").replace(".mdx", "")
-        
-        # Handle specific mapping rules for this project:
-        # content/docs/docs/* -> /docs/* (docs section)
-        # content/docs/ext/* -> /ext/* (extension section)  
-        # content/docs/pgsql/* -> /pgsql/* (postgresql section)
-        # content/docs/node/* -> /node/* (node section)
-        # content/docs/infra/* -> /infra/* (infra section)
-        # content/docs/redis/* -> /redis/* (redis section)
-        # content/docs/minio/* -> /minio/* (minio section)
-        # content/docs/etcd/* -> /etcd/* (etcd section)
-        # content/docs/ferret/* -> /ferret/* (ferret section)
-        # content/docs/docker/* -> /docker/* (docker section)
-        # content/docs/app/* -> /app/* (app section)
-        # content/docs/index.mdx -> / (home page)
-        # content/stub/* -> /stub/*
-        
-        if relative_path.startswith("docs/"):
-            # Remove "docs/" prefix to get the actual path
-            inner_path = relative_path[5:]
-            
-            # docs/index.mdx -> / (home page)
-            if inner_path == "index" or inner_path == "":
-                relative_path = "/"
-            # Special handling for docs/docs/* -> /docs/*
-            elif inner_path.startswith("docs/"):
-                relative_path = "/" + inner_path
-            # Special handling for other sections that map to root level
-            elif inner_path.startswith(("ext/", "pgsql/", "node/", "infra/", "redis/", "minio/", "etcd/", "ferret/", "docker/", "app/")):
-                relative_path = "/" + inner_path
-            else:
-                # Other content in docs/ maps to root
-                relative_path = "/" + inner_path
-        elif relative_path.startswith("stub/"):
-            # content/stub/* maps to /stub/*
-            relative_path = "/" + relative_path
-        else:
-            # Other paths get leading slash
-            relative_path = "/" + relative_path
-        
-        # Handle (name) bracket omission routing
-        # e.g., docs/(home)/index -> docs/
-        # e.g., docs/(home)/about -> docs/about
-        relative_path = re.sub(r'/\([^)]+\)', '', relative_path)
-        
-        # Handle index files
-        if relative_path.endswith("/index"):
-            relative_path = relative_path.replace("/index", "/")
-        elif relative_path == "index":
-            relative_path = "/"
-        elif relative_path == "":
-            # Empty path becomes root
-            relative_path = "/"
-        
-        # Ensure leading slash
-        if not relative_path.startswith("/"):
-            relative_path = "/" + relative_path
-        
-        # Handle Chinese/international routing (zh suffix)
-        # If file has .zh.mdx, it should map to /zh/ prefix
-        original_file = file_path.replace(self.content_dir + "/", "")
-        if original_file.endswith(".zh.mdx"):
-            # Extract the Chinese version path by processing the same way as English version
-            zh_file_path = original_file.replace(".zh.mdx", ".mdx")
-            zh_relative = zh_file_path.replace(".mdx", "")
-            
-            if zh_relative.startswith("docs/"):
-                # Remove "docs/" prefix to get the actual path
-                inner_path = zh_relative[5:]
-                
-                # docs/index.mdx -> / (home page)
-                if inner_path == "index" or inner_path == "":
-                    zh_relative = "/"
-                # Special handling for docs/docs/* -> /docs/*
-                elif inner_path.startswith("docs/"):
-                    zh_relative = "/" + inner_path
-                # Special handling for other sections that map to root level
-                elif inner_path.startswith(("ext/", "pgsql/", "node/", "infra/", "redis/", "minio/", "etcd/", "ferret/", "docker/", "app/")):
-                    zh_relative = "/" + inner_path
-                else:
-                    # Other content in docs/ maps to root
-                    zh_relative = "/" + inner_path
-            elif zh_relative.startswith("stub/"):
-                # content/stub/* maps to /stub/*
-                zh_relative = "/" + zh_relative
-            else:
-                if not zh_relative.startswith("/"):
-                    zh_relative = "/" + zh_relative
-            
-            # Handle index files for Chinese version
-            if zh_relative.endswith("/index"):
-                zh_relative = zh_relative.replace("/index", "/")
-            elif zh_relative == "index":
-                zh_relative = "/"
-            
-            # Add /zh prefix to the resolved path
-            if zh_relative == "/":
-                relative_path = "/zh"
-            else:
-                relative_path = "/zh" + zh_relative
-        
-        return relative_path
+        relative_path = file_path[len(self.content_dir) + 1:] if file_path.startswith(self.content_dir + "/") else file_path
+        is_chinese = relative_path.endswith(".zh.mdx")
+        url = "/" + relative_path[:-len(".zh.mdx") if is_chinese else -len(".mdx")]
+        for pattern, replacement in ROUTE_RULES:
+            url = pattern.sub(replacement, url)
+        url = url or "/"
+        if is_chinese:
+            return "/zh" if url == "/" else "/zh" + url
+        return url
     
     def _add_dynamic_extension_pages(self):
         """Add dynamic extension pages from data/extensions/ directory."""
@@ -300,92 +235,67 @@ class FumaDocsLinkChecker:
         }
         self.file_anchors[virtual_file] = common_anchors
     
-    def _extract_anchors(self, file_path: str):
-        """Extract all anchors from a file."""
+    def _scan_file(self, file_path: str):
+        """Read a file once, collect its anchors and its internal links with line numbers."""
         anchors = set()
-        
+        links = []
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                
-                # Extract markdown headers with improved regex
-                # Match headers from # to ###### with optional leading/trailing spaces
-                header_pattern = re.compile(r'^#{1,6}\s+(.+?)(?:\s*{[^}]*})?\s*$', re.MULTILINE)
-                header_matches = header_pattern.findall(content)
-                
-                for header in header_matches:
-                    # Remove any trailing {#custom-id} if present
-                    header = re.sub(r'\s*{#[^}]*}\s*$', '', header)
-                    anchor = self._header_to_anchor(header)
-                    if anchor:  # Only add non-empty anchors
-                        anchors.add(anchor)
-                
-                # Extract manual anchors [#anchor-id]
-                manual_anchors = self.manual_anchor_pattern.findall(content)
-                for anchor in manual_anchors:
-                    if anchor:  # Only add non-empty anchors
-                        anchors.add(anchor)
-                
-                # Extract HTML id attributes
-                html_id_pattern = re.compile(r'id=["\']([^"\']+)["\']')
-                html_ids = html_id_pattern.findall(content)
-                for html_id in html_ids:
-                    if html_id:
-                        anchors.add(html_id)
-        
         except Exception as e:
             print(f"Warning: Could not read {file_path}: {e}")
+            self.file_anchors[file_path] = anchors
+            self.file_links[file_path] = links
+            return
+        
+        # Markdown headers from # to ######, without any trailing {#custom-id}
+        for header in HEADER_PATTERN.findall(content):
+            anchor = self._header_to_anchor(HEADER_ID_PATTERN.sub('', header))
+            if anchor:
+                anchors.add(anchor)
+        
+        # Manual anchors [#anchor-id] and HTML id attributes
+        anchors.update(anchor for anchor in MANUAL_ANCHOR_PATTERN.findall(content) if anchor)
+        anchors.update(html_id for html_id in HTML_ID_PATTERN.findall(content) if html_id)
+        
+        # Line numbers from newline offsets, markdown links come before html links of the same line
+        newlines = [match.start() for match in NEWLINE_PATTERN.finditer(content)]
+        for match in MARKDOWN_LINK_PATTERN.finditer(content):
+            url = match.group(2)
+            if url is not None and self._is_internal_link(url):
+                links.append((bisect_right(newlines, match.start()) + 1, 0, match.group(1), url, 'markdown'))
+        for match in HTML_LINK_PATTERN.finditer(content):
+            url = match.group(1)
+            if self._is_internal_link(url):
+                links.append((bisect_right(newlines, match.start()) + 1, 1, '', url, 'html'))
+        links.sort(key=lambda link: link[:2])
         
         self.file_anchors[file_path] = anchors
+        self.file_links[file_path] = [
+            LinkReference(file_path=file_path, line_number=line_number, link_text=link_text, url=url, link_type=link_type)
+            for line_number, _, link_text, url, link_type in links
+        ]
     
     def _header_to_anchor(self, header_text: str) -> str:
         """Convert header text to anchor ID following common web framework rules."""
         # Handle special cases for programming languages
-        special_cases = {
-            'C++': 'c-1',
-            'C#': 'c-2',
-            'F#': 'f-sharp',
-            '.NET': 'net',
-        }
-        
-        if header_text.strip() in special_cases:
-            return special_cases[header_text.strip()]
-        
-        # Step 1: Handle markdown links [text](url) - keep only the text part
-        clean_text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', header_text)
-        
-        # Step 2: Remove backticks but preserve the content
-        clean_text = re.sub(r'`([^`]*)`', r'\1', clean_text)
-        
-        # Step 3: Remove other markdown formatting (bold, italic, etc.) but keep underscores
-        clean_text = re.sub(r'[*{}]', '', clean_text)
-        
-        # Step 4: Remove remaining brackets and parentheses
-        clean_text = re.sub(r'[\[\]()]', '', clean_text)
+        special = ANCHOR_SPECIAL_CASES.get(header_text.strip())
+        if special:
+            return special
         
-        # Step 5: Remove HTML tags if any
-        clean_text = re.sub(r'<[^>]+>', '', clean_text)
+        # Strip markdown links, code, formatting, brackets and HTML tags, keep the text
+        clean_text = header_text
+        for pattern, replacement in ANCHOR_RULES:
+            clean_text = pattern.sub(replacement, clean_text)
         
-        # Step 6: Convert to lowercase
-        clean_text = clean_text.lower()
+        # Lowercase, remove punctuation but keep underscores and basic word characters
+        clean_text = ANCHOR_PUNCTUATION.sub('', clean_text.lower())
         
-        # Step 7: Remove punctuation but keep underscores and basic word characters
-        # This handles cases like pg_stat_statements correctly
-        clean_text = re.sub(r'[^\w\s-]', '', clean_text)
+        # Replace whitespace runs with single hyphens, but keep underscores
+        anchor = ANCHOR_HYPHENS.sub('-', ANCHOR_SPACES.sub(' ', clean_text).replace(' ', '-'))
         
-        # Step 9: Replace multiple spaces/whitespace with single space
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        
-        # Step 10: Replace spaces with hyphens, but keep underscores
-        anchor = clean_text.replace(' ', '-')
-        
-        # Step 11: Replace multiple consecutive hyphens with single hyphen
-        anchor = re.sub(r'-+', '-', anchor)
-        
-        # Step 12: Remove leading/trailing hyphens
+        # Remove leading/trailing hyphens, fall back to 'heading' if nothing is left
         anchor = anchor.strip('-')
-        
-        # Step 13: Handle edge cases - if anchor is empty, generate a fallback
         if not anchor:
             anchor = 'heading'
         
@@ -431,59 +341,19 @@ class FumaDocsLinkChecker:
         print("Anchor generation test completed.")
     
     def extract_all_links(self):
-        """Extract all internal links from all MDX files."""
+        """Collect internal links of all MDX files, scanned by build_file_index."""
         print("Extracting links...")
         
         for file_path in self.file_to_url_map.keys():
-            self._extract_links_from_file(file_path)
+            # Virtual files (dynamic extension pages) have no links
+            self.all_links.extend(self.file_links.get(file_path, ()))
         
         print(f"Found {len(self.all_links)} internal links")
     
-    def _extract_links_from_file(self, file_path: str):
-        """Extract links from a single file."""
-        # Skip virtual files (dynamic extension pages)
-        if file_path.startswith("virtual://"):
-            return
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-                for line_num, line in enumerate(lines, 1):
-                    # Extract markdown links
-                    markdown_matches = self.markdown_link_pattern.findall(line)
-                    for match in markdown_matches:
-                        if len(match) == 4:  # Regular link [text](url)
-                            link_text, url = match[2], match[3]
-                        else:  # Image link ![alt](url)
-                            link_text, url = match[0], match[1]
-                        
-                        if self._is_internal_link(url):
-                            self.all_links.append(LinkReference(
-                                file_path=file_path,
-                                line_number=line_num,
-                                link_text=link_text,
-                                url=url,
-                                link_type='markdown'
-                            ))
-                    
-                    # Extract HTML links
-                    html_matches = self.html_link_pattern.findall(line)
-                    for url in html_matches:
-                        if self._is_internal_link(url):
-                            self.all_links.append(LinkReference(
-                                file_path=file_path,
-                                line_number=line_num,
-                                link_text='',
-                                url=url,
-                                link_type='html'
-                            ))
-        
-        except Exception as e:
-            print(f"Warning: Could not read {file_path}: {e}")
-    
-    def _is_internal_link(self, url: str) -> bool:
-        """Check if URL is an internal relative link."""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _is_internal_link(url: str) -> bool:
+        """Check if URL is an internal relative link, memoized: pages repeat the same links."""
         parsed = urlparse(url)
         
         # Skip external links (with scheme or netloc)
@@ -578,8 +448,7 @@ class FumaDocsLinkChecker:
     def _is_static_asset(self, url: str) -> bool:
         """Check if URL refers to a static asset."""
         # Common static asset paths in Next.js
-        static_prefixes = ['/img/', '/images/', '/assets/', '/static/', '/favicon', '/logo', '/robots.txt', '/sitemap.xml']
-        return any(url.startswith(prefix) for prefix in static_prefixes)
+        return url.startswith(('/img/', '/images/', '/assets/', '/static/', '/favicon', '/logo', '/robots.txt', '/sitemap.xml'))
     
     def _get_static_file_path(self, url: str) -> str:
         """Convert static asset URL to file path."""
@@ -591,8 +460,11 @@ class FumaDocsLinkChecker:
     
     def _resolve_relative_url(self, current_url: str, target_url: str) -> str:
         """Resolve relative URL against current URL."""
-        # Use urljoin to properly resolve relative paths
-        resolved = urljoin(current_url, target_url)
+        # Use urljoin to properly resolve relative paths, absolute paths do not depend on the page
+        key = target_url if target_url.startswith('/') else (current_url, target_url)
+        resolved = self.resolved_urls.get(key)
+        if resolved is None:
+            resolved = self.resolved_urls[key] = urljoin(current_url, target_url)
         return resolved
     
     def print_url_mappings(self):
@@ -9,9 +9,30 @@ import os
 import csv
 import json
 import re
+import atexit
+import hashlib
+import pickle
+import tempfile
+import threading
 from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict, Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
+from fnmatch import fnmatch
+from functools import cached_property
+
+# Repository root, and the local cache directory for generator state (gitignored)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+CACHE_DIR = os.path.join(ROOT_DIR, '.cache')
+
+
+def _code_digest() -> str:
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+# Digest of this module, part of pickle cache keys: the cached dataclasses and the parsing code
+# that built them live here, so any change to this file invalidates the caches
+CODE_DIGEST = _code_digest()
 
 
 # =============================================================================
@@ -404,6 +425,451 @@ class DataLoader:
         return extensions
 
 
+class Dataset:
+    """Input data shared by all list generators, parsed lazily and at most once.
+
+    Parsed parts are pickled under .cache/ together with the (path, mtime_ns, size)
+    signature of their source files and CODE_DIGEST, and reused until either changes.
+    """
+
+    def __init__(self, config: Config = None, use_cache: bool = True):
+        self.config = config or Config()
+        self.data_loader = DataLoader(self.config)
+        self.use_cache = use_cache
+        self.ext_dir = os.path.join(self.config.DATA_DIR, 'ext')
+
+    def _signature(self, paths: List[str]) -> Tuple[str, List[Tuple[str, int, int]]]:
+        signature = []
+        for path in paths:
+            st = os.stat(path)
+            signature.append((os.path.relpath(path, ROOT_DIR), st.st_mtime_ns, st.st_size))
+        return CODE_DIGEST, signature
+
+    def _cached(self, name: str, paths: List[str], load):
+        """Return the cached part if its sources are unchanged, otherwise load and cache it."""
+        if not self.use_cache:
+            return load()
+        cache_path = os.path.join(CACHE_DIR, f'dataset-{name}.pickle')
+        signature = self._signature(paths)
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_signature, value = pickle.load(f)
+            if cached_signature == signature:
+                return value
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            pass
+        value = load()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((signature, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return value
+
+    @cached_property
+    def extensions(self) -> List[Extension]:
+        """All extensions from extension.csv, shared read-only by generators."""
+        return self._cached('extensions', [os.path.join(self.config.DATA_DIR, 'extension.csv')],
+                            self.data_loader.load_extensions)
+
+    @cached_property
+    def categories(self) -> Dict[str, Category]:
+        """Category metadata from category.csv."""
+        return self._cached('categories', [os.path.join(self.config.DATA_DIR, 'category.csv')],
+                            self.data_loader.load_categories)
+
+    @cached_property
+    def leading_map(self) -> Dict[str, str]:
+        return build_leading_map(self.extensions)
+
+    @cached_property
+    def ext_data(self) -> Dict[str, Dict[str, Any]]:
+        """Per extension data/ext/{name}.json documents, keyed by extension name."""
+        if not os.path.isdir(self.ext_dir):
+            print(f"Warning: {self.ext_dir} not found")
+            return {}
+        paths = sorted(os.path.join(self.ext_dir, f) for f in os.listdir(self.ext_dir) if f.endswith('.json'))
+        return self._cached('ext', paths, lambda: self._load_ext_data(paths))
+
+    def _load_ext_data(self, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        ext_data = {}
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    ext_data[os.path.basename(path)[:-5]] = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Warning: Could not read {path}: {e}")
+        print(f"Loaded {len(ext_data)} extension data files.")
+        return ext_data
+
+    @cached_property
+    def matrix(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Per package matrix entries, keyed by package name."""
+        matrix = {}
+        for data in self.ext_data.values():
+            if 'matrix' in data and data.get('pkg'):
+                matrix.setdefault(data['pkg'], data['matrix'])
+        return matrix
+
+    @cached_property
+    def availability(self) -> 'AvailabilityIndex':
+        """Matrix entries of all extensions keyed by (ext, os, pg)."""
+        return AvailabilityIndex(self.ext_data)
+
+    @cached_property
+    def details(self) -> 'ExtensionDetailStore':
+        """Compact per extension details of data/ext documents, parsed on demand."""
+        return ExtensionDetailStore(self.ext_dir)
+
+    @cached_property
+    def dependencies(self) -> 'DependencyGraph':
+        """Dependency graph of all extensions."""
+        return DependencyGraph(self.extensions)
+
+    @cached_property
+    def ext_digests(self) -> Dict[str, str]:
+        """sha256 of each data/ext/{name}.json file, keyed by extension name."""
+        if not os.path.isdir(self.ext_dir):
+            return {}
+        paths = sorted(os.path.join(self.ext_dir, f) for f in os.listdir(self.ext_dir) if f.endswith('.json'))
+
+        def load():
+            digests = {}
+            for path in paths:
+                with open(path, 'rb') as f:
+                    digests[os.path.basename(path)[:-5]] = hashlib.sha256(f.read()).hexdigest()
+            return digests
+
+        return self._cached('ext-digest', paths, load)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Comparable snapshot of the dataset: extension rows by id, categories, data/ext digests."""
+        return {
+            'extensions': {ext.id: asdict(ext) for ext in self.extensions},
+            'categories': {name: asdict(category) for name, category in self.categories.items()},
+            'ext_data': self.ext_digests,
+        }
+
+
+class AvailabilityIndex:
+    """Matrix entries of data/ext documents keyed by (ext, 'os_code.os_arch', pg), built in one pass.
+
+    With fields given, only those keys of each entry are kept, for a compact index.
+    """
+
+    def __init__(self, ext_data: Dict[str, Dict[str, Any]], fields: Tuple[str, ...] = None):
+        self.entries = {}
+        self.extensions = set()  # extensions that have a matrix at all
+        self.fields = fields
+        for name, data in ext_data.items():
+            self.add(name, data)
+
+    def add(self, name: str, data: Dict[str, Any]):
+        """Index the matrix of one data/ext document."""
+        if 'matrix' not in data:
+            return
+        self.extensions.add(name)
+        for entry in data['matrix']:
+            key = (name, f"{entry.get('os_code')}.{entry.get('os_arch')}", str(entry.get('pg', '')))
+            if key in self.entries:  # first entry wins, as with a linear scan
+                continue
+            if self.fields is not None:
+                entry = {column: entry[column] for column in self.fields if column in entry}
+            self.entries[key] = entry
+
+    def __contains__(self, ext_name: str) -> bool:
+        return ext_name in self.extensions
+
+    def get(self, ext_name: str, platform: str, pg) -> Dict[str, Any]:
+        """Matrix entry of an extension on a platform like el9.x86_64 for a PG major, {} if absent."""
+        return self.entries.get((ext_name, platform, str(pg)), {})
+
+    def status(self, ext_name: str, platform: str, pg) -> str:
+        """Availability of an extension on a platform for a PG major: available, warning or missing."""
+        entry = self.get(ext_name, platform, pg)
+        if not entry or entry.get('miss', False) or entry.get('hide', False):
+            return 'missing'
+        if entry.get('warn', False):
+            return 'warning'
+        return 'available'
+
+
+@dataclass
+class ExtensionDetail:
+    """The parts of a data/ext/{name}.json document used by category page callouts."""
+    version: Optional[str] = 'Unknown'
+    web: Optional[str] = None
+    contrib: bool = False  # contrib flag set, or CONTRIB repo
+    pg_ver: List[str] = field(default_factory=list)
+    availability: AvailabilityIndex = field(default_factory=lambda: AvailabilityIndex({}))  # badge state only
+
+    BADGE_FIELDS = ('hide', 'miss', 'pkg_repo')
+
+    @classmethod
+    def from_data(cls, ext_name: str, data: Dict[str, Any]) -> 'ExtensionDetail':
+        return cls(
+            version=data.get('version', 'Unknown'),
+            web=data.get('web'),
+            contrib=bool(data.get('contrib', False) or (data.get('repo') or '').upper() == 'CONTRIB'),
+            pg_ver=[str(v) for v in data.get('pg_ver', [])],
+            availability=AvailabilityIndex({ext_name: data}, fields=cls.BADGE_FIELDS),
+        )
+
+
+class ExtensionDetailStore:
+    """ExtensionDetail of each data/ext file, parsed at most once per process.
+
+    Only the compact details are kept in memory. They are also pickled under .cache/ keyed by
+    file mtime and size, so a later run only parses the files that changed; the whole cache
+    is dropped when CODE_DIGEST changes.
+    """
+
+    def __init__(self, ext_dir: str, cache_path: str = None):
+        self.ext_dir = ext_dir
+        self.cache_path = cache_path or os.path.join(CACHE_DIR, 'ext-detail.pickle')
+        self.details = {}
+        self.disk = self._load_cache()  # name -> (mtime_ns, size, ExtensionDetail)
+        self.dirty = False
+
+    def _load_cache(self) -> Dict[str, Tuple]:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                digest, disk = pickle.load(f)
+            return disk if digest == CODE_DIGEST else {}
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ValueError, TypeError):
+            return {}
+
+    def get(self, ext_name: str) -> ExtensionDetail:
+        """Details of an extension, defaults if its file is missing or unreadable."""
+        detail = self.details.get(ext_name)
+        if detail is not None:
+            return detail
+        path = os.path.join(self.ext_dir, f'{ext_name}.json')
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            detail = self.details[ext_name] = ExtensionDetail()
+            return detail
+        cached = self.disk.get(ext_name)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            detail = cached[2]
+        else:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    detail = ExtensionDetail.from_data(ext_name, json.load(f))
+            except (json.JSONDecodeError, IOError):
+                detail = ExtensionDetail()
+            self.disk[ext_name] = (st.st_mtime_ns, st.st_size, detail)
+            self.dirty = True
+        self.details[ext_name] = detail
+        return detail
+
+    def save(self):
+        """Persist parsed details for the next run."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((CODE_DIGEST, self.disk), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+class DependencyGraph:
+    """Extension dependency graph from requires / require_by and package level rpm_deps / deb_deps.
+
+    Built once: strongly connected components are computed up front, so transitive closure,
+    install order and cycles are lookups afterwards. Package dependencies are resolved to the
+    leading extension of the package that provides them, others are kept as external packages.
+    """
+
+    def __init__(self, extensions: List[Extension]):
+        self.extensions = {ext.name: ext for ext in extensions}
+        leading_map = build_leading_map(extensions)
+        providers = defaultdict(set)  # package name template -> pkgs, e.g. pgvector_$v -> {pgvector}
+        for ext in extensions:
+            for spec in (ext.rpm_pkg, ext.deb_pkg):
+                for template in (spec or '').split():
+                    providers[template.rstrip('*')].add(ext.pkg)
+
+        self.requires = {name: [] for name in self.extensions}  # direct dependencies, in declaration order
+        self.external = {name: [] for name in self.extensions}  # package dependencies not provided by any extension
+        for ext in extensions:
+            for dep in ext.requires:
+                self._add_edge(ext.name, dep)
+            for dependant in ext.require_by:
+                self._add_edge(dependant, ext.name)
+            for template in ext.rpm_deps + ext.deb_deps:
+                pkgs = providers.get(template)
+                if not pkgs:
+                    if template not in self.external[ext.name]:
+                        self.external[ext.name].append(template)
+                elif len(pkgs) == 1:  # shared packages such as postgresql$v-contrib name no single extension
+                    pkg = next(iter(pkgs))
+                    if pkg != ext.pkg and pkg in leading_map:
+                        self._add_edge(ext.name, leading_map[pkg])
+
+        self.require_by = {name: [] for name in self.requires}
+        for name, deps in self.requires.items():
+            for dep in deps:
+                self.require_by[dep].append(name)
+        self._build_components()
+
+    def _add_edge(self, name: str, dep: str):
+        self.requires.setdefault(name, [])
+        self.requires.setdefault(dep, [])  # unknown extensions are kept as leaf nodes
+        self.external.setdefault(name, [])
+        self.external.setdefault(dep, [])
+        if dep != name and dep not in self.requires[name]:
+            self.requires[name].append(dep)
+
+    def _build_components(self):
+        """Tarjan's algorithm, iterative. Components come out dependencies first."""
+        index, lowlink, on_stack, stack = {}, {}, set(), []
+        self.components = []  # list of member lists, in topological (install) order
+        self.component_of = {}
+        for root in self.requires:
+            if root in index:
+                continue
+            work = [(root, iter(self.requires[root]))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.requires[dep])))
+                        break
+                    if dep in on_stack:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            members.append(member)
+                            if member == node:
+                                break
+                        for member in members:
+                            self.component_of[member] = len(self.components)
+                        self.components.append(members)
+        self.order = {name: i for i, name in enumerate(name for members in self.components for name in members)}
+        self._closure = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.extensions
+
+    def get(self, name: str) -> Optional[Extension]:
+        """Extension by name, None if it is not in extension.csv."""
+        return self.extensions.get(name)
+
+    def closure(self, name: str) -> frozenset:
+        """All extensions required by an extension, directly or transitively, excluding itself."""
+        component = self.component_of.get(name)
+        if component is None:
+            return frozenset()
+        return self._component_closure(component) - {name}
+
+    def _component_closure(self, component: int) -> frozenset:
+        # Dependencies always sit in earlier components, so this recursion only goes backwards
+        result = self._closure.get(component)
+        if result is None:
+            members = self.components[component]
+            reached = set(members) if len(members) > 1 else set()
+            for member in members:
+                for dep in self.requires[member]:
+                    dep_component = self.component_of[dep]
+                    if dep_component != component:
+                        reached.add(dep)
+                        reached |= self._component_closure(dep_component)
+            result = self._closure[component] = frozenset(reached)
+        return result
+
+    def install_order(self, names: List[str]) -> List[str]:
+        """The given extensions and everything they require, dependencies first."""
+        wanted = set()
+        for name in names:
+            if name in self.requires:
+                wanted.add(name)
+                wanted |= self.closure(name)
+        return sorted(wanted, key=self.order.__getitem__)
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of extensions that require each other."""
+        return [members[::-1] for members in self.components if len(members) > 1]
+
+
+# Extension fields rendered by the shared TableGenerator tables, lead feeds the leading map
+TABLE_FIELDS = frozenset({'id', 'name', 'pkg', 'lead', 'en_desc', 'zh_desc'})
+
+
+@dataclass
+class DatasetChanges:
+    """Differences between two dataset snapshots."""
+    fields: Dict[int, set] = field(default_factory=dict)  # extension id -> changed fields, all fields if added / removed
+    categories: set = field(default_factory=set)  # category codes whose metadata changed
+    ext_data: set = field(default_factory=set)  # extension names whose data/ext document changed
+    before: Dict[int, Dict] = field(default_factory=dict)
+    after: Dict[int, Dict] = field(default_factory=dict)
+
+    @classmethod
+    def diff(cls, old: Dict[str, Any], new: Dict[str, Any]) -> 'DatasetChanges':
+        """Diff two Dataset.snapshot() results by extension id."""
+        changes = cls(before=old['extensions'], after=new['extensions'])
+        for ext_id in changes.before.keys() | changes.after.keys():
+            before, after = changes.before.get(ext_id), changes.after.get(ext_id)
+            if before is None or after is None:
+                changes.fields[ext_id] = set((before or after).keys())
+                continue
+            changed = {name for name, value in after.items() if before.get(name) != value}
+            if changed:
+                changes.fields[ext_id] = changed
+        old_categories, new_categories = old['categories'], new['categories']
+        changes.categories = {code for code in old_categories.keys() | new_categories.keys()
+                              if old_categories.get(code) != new_categories.get(code)}
+        old_digests, new_digests = old['ext_data'], new['ext_data']
+        changes.ext_data = {name for name in old_digests.keys() | new_digests.keys()
+                            if old_digests.get(name) != new_digests.get(name)}
+        return changes
+
+    @property
+    def empty(self) -> bool:
+        return not (self.fields or self.categories or self.ext_data)
+
+    def affects(self, fields: Optional[set], inputs: List[str]) -> bool:
+        """Whether a generator reading these extension fields (None: all) and Dataset parts must rerun."""
+        if 'categories' in inputs and self.categories:
+            return True
+        if self.ext_data and {'ext_data', 'details', 'availability'} & set(inputs):
+            return True
+        return any(fields is None or changed & fields for changed in self.fields.values())
+
+    def affected_categories(self, fields: Optional[set]) -> set:
+        """Category codes whose pages depend on the changed extensions, categories and data/ext documents."""
+        categories, pkgs = set(self.categories), set()
+        for ext_id, changed in self.fields.items():
+            if fields is not None and not changed & fields:
+                continue
+            rows = [row for row in (self.before.get(ext_id), self.after.get(ext_id)) if row]
+            categories.update(row['category'] for row in rows)  # both the old and the new category
+            if changed & {'lead', 'pkg'}:  # leading map links of sibling rows change too
+                pkgs.update(row['pkg'] for row in rows)
+        for row in self.after.values():
+            if row['pkg'] in pkgs or row['name'] in self.ext_data:
+                categories.add(row['category'])
+        return categories
+
+
 # =============================================================================
 # TABLE GENERATION FUNCTIONS
 # =============================================================================
@@ -539,13 +1005,132 @@ class TableGenerator:
 # CONTENT WRITING UTILITY
 # =============================================================================
 
+class OutputWriter:
+    """Write generated files only when their content changed.
+
+    A manifest maps each output path (relative to the repo root) to [sha256, size, mtime_ns].
+    A file whose size and mtime still match its entry is compared by hash alone; others are
+    compared against the bytes on disk. Changed files are replaced atomically, so unchanged
+    pages keep their mtime and the docs build cache stays valid.
+    """
+
+    def __init__(self, manifest_path: str = None):
+        self.manifest_path = manifest_path or os.path.join(CACHE_DIR, 'output-manifest.json')
+        self.entries = self._load_manifest()
+        self.updated = {}
+        self.lock = threading.Lock()  # bookkeeping is shared by writer threads
+        self.changed = 0
+        self.unchanged = 0
+
+    def _load_manifest(self) -> Dict[str, List]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _is_current(self, path: str, key: str, data: bytes, digest: str) -> bool:
+        """Check whether the file on disk already holds data."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_size != len(data):
+            return False
+        entry = self.entries.get(key)
+        if entry and entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+            return entry[0] == digest
+        with open(path, 'rb') as f:  # unknown or touched file, compare the bytes
+            return f.read() == data
+
+    def write(self, path: str, content) -> bool:
+        """Write str or bytes content to path if it differs, return True if the file was written."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.abspath(path)
+        key = os.path.relpath(path, ROOT_DIR)
+        written = not self._is_current(path, key, data, digest)
+        if written:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        st = os.stat(path)
+        with self.lock:
+            if written:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+            self.updated[key] = [digest, st.st_size, st.st_mtime_ns]
+        return written
+
+    def intact(self, patterns: List[str]) -> bool:
+        """Check that each output matching the patterns is recorded and still holds what was written."""
+        for pattern in patterns:
+            keys = [key for key in self.entries if fnmatch(key, pattern)]
+            if not keys:
+                return False
+            for key in keys:
+                digest, size, mtime_ns = self.entries[key]
+                path = os.path.join(ROOT_DIR, key)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    return False
+                if st.st_size != size:
+                    return False
+                if st.st_mtime_ns != mtime_ns:  # touched, compare the content
+                    with open(path, 'rb') as f:
+                        if hashlib.sha256(f.read()).hexdigest() != digest:
+                            return False
+        return True
+
+    def save(self):
+        """Merge entries recorded by this writer into the manifest file."""
+        if not self.updated:
+            return
+        entries = self._load_manifest()  # another generator process may have saved meanwhile
+        entries.update(self.updated)
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.manifest_path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self.entries, self.updated = entries, {}
+
+    def summary(self) -> str:
+        return f"{self.changed} changed, {self.unchanged} unchanged"
+
+
+_output_writer = None
+
+
+def get_output_writer() -> OutputWriter:
+    """Get the process wide output writer, its manifest is saved on exit."""
+    global _output_writer
+    if _output_writer is None:
+        _output_writer = OutputWriter()
+        atexit.register(_output_writer.save)
+    return _output_writer
+
+
+def write_output(path: str, content) -> bool:
+    """Write content to path through the shared output writer, return True if it changed."""
+    written = get_output_writer().write(path, content)
+    print(f"{'Generated' if written else 'Unchanged'}: {path}")
+    return written
+
+
 def write_content(config: Config, filename: str, content: str):
-    """Write content to file in the output directory."""
-    output_path = os.path.join(config.OUTPUT_DIR, filename)
-    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"Generated: {output_path}")
+    """Write content to file in the output directory, skipped if unchanged."""
+    write_output(os.path.join(config.OUTPUT_DIR, filename), content)
 
 
 def build_leading_map(extensions: List[Extension]) -> Dict[str, str]:
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+"""
+Local fake repository mirror for offline reload-repo.py benchmarks.
+Serves synthetic repomd.xml / primary.sqlite.{bz2,xz,zst,gz} / Release / Packages files for any
+upstream path under /{host}/{path}, with configurable latency and bandwidth.
+
+    python bin/fake-mirror.py --port 8765 --delay 0.2 --rate 2000000 --codec xz
+    python bin/reload-repo.py --dry-run --mirror http://127.0.0.1:8765
+"""
+
+import argparse
+import bz2
+import gzip
+import hashlib
+import lzma
+import sqlite3
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# primary_db compressors, keyed by file suffix
+CODECS = {
+    'bz2': bz2.compress,
+    'xz': lzma.compress,
+    'gz': gzip.compress,
+}
+if zstandard is not None:
+    CODECS['zst'] = lambda data: zstandard.ZstdCompressor().compress(data)
+
+PRIMARY_COLUMNS = [
+    'pkgKey', 'pkgId', 'name', 'arch', 'version', 'epoch', 'release', 'summary', 'description', 'url',
+    'time_file', 'time_build', 'rpm_license', 'rpm_vendor', 'rpm_group', 'rpm_buildhost', 'rpm_sourcerpm',
+    'rpm_header_start', 'rpm_header_end', 'rpm_packager', 'size_package', 'size_installed', 'size_archive',
+    'location_href', 'location_base', 'checksum_type',
+]
+
+
+def build_primary_db(packages):
+    """Build a synthetic primary.sqlite image with the given number of packages"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("""
+        CREATE TABLE packages (pkgKey INTEGER PRIMARY KEY, pkgId TEXT, name TEXT, arch TEXT, version TEXT,
+            epoch TEXT, release TEXT, summary TEXT, description TEXT, url TEXT, time_file INTEGER,
+            time_build INTEGER, rpm_license TEXT, rpm_vendor TEXT, rpm_group TEXT, rpm_buildhost TEXT,
+            rpm_sourcerpm TEXT, rpm_header_start INTEGER, rpm_header_end INTEGER, rpm_packager TEXT,
+            size_package INTEGER, size_installed INTEGER, size_archive INTEGER, location_href TEXT,
+            location_base TEXT, checksum_type TEXT)
+    """)
+    rows = []
+    for i in range(1, packages + 1):
+        name = f"pgext{i % 500}_{13 + i % 6}"
+        version = f"{i % 7}.{i % 11}.{i % 3}"
+        rows.append((
+            i, hashlib.sha256(str(i).encode()).hexdigest(), name, 'x86_64', version, '0', '1PGDG.rhel9',
+            f"summary of {name}", f"description of {name} " * 8, 'https://example.com', 1700000000 + i,
+            1700000000 + i, 'PostgreSQL', None, 'Unspecified', 'localhost', f"{name}-{version}-1.src.rpm",
+            4504, 9000 + i, 'Pigsty', 100000 + i, 300000 + i, 300500 + i,
+            f"{name}-{version}-1PGDG.rhel9.x86_64.rpm", None, 'sha256',
+        ))
+    conn.executemany(f"INSERT INTO packages VALUES ({', '.join('?' * len(PRIMARY_COLUMNS))})", rows)
+    conn.commit()
+    image = conn.serialize()
+    conn.close()
+    return image
+
+
+def build_packages_file(packages):
+    """Build a synthetic APT Packages file with the given number of stanzas"""
+    stanzas = []
+    for i in range(1, packages + 1):
+        name = f"postgresql-{13 + i % 6}-pgext{i % 500}"
+        stanzas.append(
+            f"Package: {name}\n"
+            f"Version: {i % 7}.{i % 11}.{i % 3}-1.pgdg120+1\n"
+            f"Architecture: amd64\n"
+            f"Maintainer: Pigsty <rh@vonng.com>\n"
+            f"Installed-Size: {100 + i % 900}\n"
+            f"Depends: libc6 (>= 2.34), postgresql-{13 + i % 6}\n"
+            f"Filename: pool/main/p/pgext{i % 500}/{name}_{i}_amd64.deb\n"
+            f"Size: {40000 + i}\n"
+            f"SHA256: {hashlib.sha256(str(i).encode()).hexdigest()}\n"
+            f"Section: database\n"
+            f"Priority: optional\n"
+            f"Description: synthetic package {i}\n"
+            f" continuation line of the long description\n"
+        )
+    return '\n'.join(stanzas).encode()
+
+
+class MirrorContent:
+    """Synthetic repository files, shared by every repo served by the mirror"""
+
+    def __init__(self, packages, codec='bz2'):
+        primary = build_primary_db(packages)
+        self.primary_sha256 = hashlib.sha256(primary).hexdigest()
+        self.primary_compressed = CODECS[codec](primary)
+        self.primary_name = f"{hashlib.sha256(self.primary_compressed).hexdigest()}-primary.sqlite.{codec}"
+        self.packages = build_packages_file(packages)
+        packages_sha256 = hashlib.sha256(self.packages).hexdigest()
+        self.release = (
+            "Origin: Fake Mirror\n"
+            "Date: " + formatdate(time.time(), usegmt=True) + "\n"
+            "SHA256:\n" + "".join(
+                f" {packages_sha256} {len(self.packages)} main/binary-{arch}/Packages\n"
+                for arch in ('amd64', 'arm64'))
+        ).encode()
+        self.repomd = f"""<?xml version="1.0" encoding="UTF-8"?>
+<repomd xmlns="http://linux.duke.edu/metadata/repo" xmlns:rpm="http://linux.duke.edu/metadata/rpm">
+  <revision>1700000000</revision>
+  <data type="primary_db">
+    <checksum type="sha256">{hashlib.sha256(self.primary_compressed).hexdigest()}</checksum>
+    <open-checksum type="sha256">{self.primary_sha256}</open-checksum>
+    <location href="repodata/{self.primary_name}"/>
+    <size>{len(self.primary_compressed)}</size>
+    <open-size>{len(primary)}</open-size>
+  </data>
+</repomd>
+""".encode()
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+    def lookup(self, path):
+        """Map a request path to file content, None if not found"""
+        if path.endswith('/repodata/repomd.xml'):
+            return self.repomd
+        if path.endswith(f'/repodata/{self.primary_name}'):
+            return self.primary_compressed
+        if path.endswith('/Packages'):
+            return self.packages
+        if path.endswith('/Release'):  # no InRelease, exercises the fallback
+            return self.release
+        return None
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    content: MirrorContent = None
+    delay: float = 0.0
+    rate: int = 0
+    lock = threading.Lock()
+    requests = 0
+
+    def _respond(self, send_body):
+        with self.lock:
+            MirrorHandler.requests += 1
+        time.sleep(self.delay)  # simulated round trip latency
+        body = self.content.lookup(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.content.last_modified)
+        self.end_headers()
+        if not send_body:
+            return
+        if not self.rate:
+            self.wfile.write(body)
+            return
+        # throttle to `rate` bytes per second
+        chunk = max(self.rate // 20, 1)
+        for offset in range(0, len(body), chunk):
+            self.wfile.write(body[offset:offset + chunk])
+            time.sleep(0.05)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake repository mirror for reload-repo.py benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--packages', type=int, default=5000, help="packages per synthetic repo")
+    parser.add_argument('--delay', type=float, default=0.1, help="latency added to each request (seconds)")
+    parser.add_argument('--rate', type=int, default=0, help="per-response bandwidth limit (bytes/s), 0 = unlimited")
+    parser.add_argument('--codec', choices=sorted(CODECS), default='bz2', help="primary_db compression")
+    args = parser.parse_args()
+
+    MirrorHandler.content = MirrorContent(args.packages, args.codec)
+    MirrorHandler.delay = args.delay
+    MirrorHandler.rate = args.rate
+    server = ThreadingHTTPServer((args.host, args.port), MirrorHandler)
+    print(f"Fake mirror listening on http://{args.host}:{args.port} "
+          f"(primary {len(MirrorHandler.content.primary_compressed)} bytes, Packages {len(MirrorHandler.content.packages)} bytes)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {MirrorHandler.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
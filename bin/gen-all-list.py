@@ -2,12 +2,23 @@
 
 """
 Generate all extension list pages.
-Master script that calls all individual list generators.
+Master script that runs all individual list generators, concurrently where their
+declared inputs and outputs allow, each in its own worker process.
 """
 
 import os
+import io
 import sys
 import time
+import pickle
+import hashlib
+import inspect
+import argparse
+import traceback
+from contextlib import redirect_stdout
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from fnmatch import fnmatch
+import multiprocessing
 
 # Add the bin directory to Python path so we can import other generators
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,70 +28,260 @@ import importlib
 
 def import_generator(module_file, class_name):
     """Import generator class from module file."""
-    # Import using the actual file name  
+    # Import using the actual file name
     import importlib.util
-    
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
     module_path = os.path.join(script_dir, f"{module_file}.py")
-    
+
     spec = importlib.util.spec_from_file_location(module_file, module_path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
-    
+
     return getattr(module, class_name)
 
-from common_utils import Config
+from common_utils import Config, Dataset, DatasetChanges, CACHE_DIR, get_output_writer
+
+# Dataset snapshot and generator source digests of the last successful run
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, 'list-snapshot.pickle')
+
+# Source files of each Dataset part, relative to the repo root
+DATASET_SOURCES = {
+    'extensions': ['data/extension.csv'],
+    'categories': ['data/category.csv'],
+    'leading_map': ['data/extension.csv'],
+    'ext_data': ['data/ext/*.json'],
+    'availability': ['data/ext/*.json'],
+    'details': ['data/ext/*.json'],
+}
+
+# All generators: module, class, description, Dataset parts read, files written (repo root relative)
+GENERATORS = [
+    ("gen-main-list", "MainIndexGenerator", "Main Extension Index",
+     ['extensions', 'categories', 'leading_map'], ['content/docs/list/index.mdx', 'content/docs/list/index.zh.mdx']),
+    ("gen-cate-list", "CategoryListGenerator", "Category-based Lists",
+     ['extensions', 'categories', 'leading_map'], ['content/docs/list/cate.mdx', 'content/docs/list/cate.zh.mdx']),
+    ("gen-cate-index", "CategoryIndexGenerator", "Individual Category Pages",
+     ['extensions', 'categories', 'leading_map', 'details'], ['content/docs/cate/*/index.mdx', 'content/docs/cate/*/index.zh.mdx',
+                                                                'content/docs/cate/*/meta.json', 'content/docs/cate/*/meta.zh.json']),
+    ("gen-lang-list", "LanguageListGenerator", "Language-based Lists",
+     ['extensions', 'leading_map'], ['content/docs/list/lang.mdx', 'content/docs/list/lang.zh.mdx']),
+    ("gen-repo-list", "RepoListGenerator", "Repository-based Lists",
+     ['extensions', 'categories', 'leading_map'], ['content/docs/list/repo.mdx', 'content/docs/list/repo.zh.mdx']),
+    ("gen-linux-list", "LinuxListGenerator", "Linux Distribution Lists",
+     ['extensions', 'leading_map', 'availability'], ['content/docs/list/linux.mdx', 'content/docs/list/linux.zh.mdx']),
+    ("gen-pgsql-list", "PGMajorListGenerator", "PostgreSQL Version Lists",
+     ['extensions', 'leading_map'], ['content/docs/list/pgsql.mdx', 'content/docs/list/pgsql.zh.mdx']),
+    ("gen-attr-list", "AttributeListGenerator", "Attribute-based Lists",
+     ['extensions', 'leading_map'], ['content/docs/list/attr.mdx', 'content/docs/list/attr.zh.mdx']),
+    ("gen-lic-list", "LicenseListGenerator", "License-based Lists",
+     ['extensions', 'leading_map'], ['content/docs/list/license.mdx', 'content/docs/list/license.zh.mdx']),
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MiB."""
+    try:  # VmHWM restarts at exec, ru_maxrss of a spawned worker would carry the parent peak on Linux
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024  # bytes on macOS, KiB on Linux
+
+
+def run_generator(module_name, class_name, config, dataset=None, options=None):
+    """Run one generator (in a worker process), return (ok, error, log, seconds, peak_rss_mb, changed, unchanged)."""
+    start = time.perf_counter()
+    writer = get_output_writer()
+    changed, unchanged = writer.changed, writer.unchanged
+    log = io.StringIO()
+    ok, error = True, None
+    with redirect_stdout(log):
+        try:
+            generator_class = import_generator(module_name, class_name)
+            generator = generator_class(config, dataset or Dataset(config))
+            generator.generate(**(options or {}))
+        except Exception as e:
+            ok, error = False, f"{e}\n{traceback.format_exc()}"
+    writer.save()  # pool workers exit without running atexit hooks
+    return (ok, error, log.getvalue(), time.perf_counter() - start, peak_rss_mb(),
+            writer.changed - changed, writer.unchanged - unchanged)
+
+
+def run_inline(module_name, class_name, config, dataset, options):
+    """Run one generator in this process, wrapped in a completed future."""
+    future = Future()
+    future.set_result(run_generator(module_name, class_name, config, dataset, options))
+    return future
+
+
+def source_digest(module_name):
+    """Digest of a generator's source and the shared common_utils module."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for filename in (f"{module_name}.py", "common_utils.py"):
+        with open(os.path.join(script_dir, filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_snapshot():
+    """Load the snapshot of the last successful run, None if missing or unreadable."""
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            return pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+
+
+def save_snapshot(snapshot):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, SNAPSHOT_PATH)
+
+
+def plan_generators(snapshot, previous, writer=None):
+    """Map generators that must run to their generate() options, from the diff against the previous snapshot."""
+    if previous is None:
+        return {generator[0]: {} for generator in GENERATORS}
+    changes = DatasetChanges.diff(previous['dataset'], snapshot['dataset'])
+    writer = writer or get_output_writer()
+    plan = {}
+    for module_name, class_name, _, inputs, outputs in GENERATORS:
+        if previous['sources'].get(module_name) != snapshot['sources'][module_name]:
+            plan[module_name] = {}  # generator code changed, rebuild everything it writes
+            continue
+        if not writer.intact(outputs):
+            plan[module_name] = {}  # outputs deleted or edited by hand since written, rebuild them
+            continue
+        generator_class = import_generator(module_name, class_name)
+        fields = getattr(generator_class, 'FIELDS', None)
+        if not changes.affects(fields, inputs):
+            continue
+        if 'only' in inspect.signature(generator_class.generate).parameters:  # supports selective pages
+            plan[module_name] = {'only': changes.affected_categories(fields)}
+        else:
+            plan[module_name] = {}
+    return plan
+
+
+def dependencies(generators):
+    """Map each generator to the generators writing any of its inputs, reject overlapping outputs."""
+    owners = {}
+    for module_name, _, _, _, outputs in generators:
+        for pattern in outputs:
+            if pattern in owners:
+                raise ValueError(f"{pattern} is written by both {owners[pattern]} and {module_name}")
+            owners[pattern] = module_name
+    deps = {}
+    for module_name, _, _, inputs, _ in generators:
+        sources = [src for part in inputs for src in DATASET_SOURCES[part]]
+        deps[module_name] = {owner for pattern, owner in owners.items() if owner != module_name
+                             and any(fnmatch(pattern, src) or fnmatch(src, pattern) for src in sources)}
+    return deps
 
 
 def main():
     """Generate all extension list pages."""
+    parser = argparse.ArgumentParser(description="Generate all extension list pages")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="generator worker processes, 1 runs in-process")
+    parser.add_argument('--full', action='store_true', help="regenerate every page, ignoring the previous run snapshot")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("PostgreSQL Extension List Generator")
     print("=" * 70)
-    
+
     start_time = time.time()
     config = Config()
-    
-    # List of all generators with their descriptions  
-    generators = [
-        ("gen-main-list", "MainIndexGenerator", "Main Extension Index"),
-        ("gen-cate-list", "CategoryListGenerator", "Category-based Lists"),
-        ("gen-cate-index", "CategoryIndexGenerator", "Individual Category Pages"),
-        ("gen-lang-list", "LanguageListGenerator", "Language-based Lists"),
-        ("gen-repo-list", "RepoListGenerator", "Repository-based Lists"), 
-        ("gen-linux-list", "LinuxListGenerator", "Linux Distribution Lists"),
-        ("gen-pgsql-list", "PGMajorListGenerator", "PostgreSQL Version Lists"),
-        ("gen-attr-list", "AttributeListGenerator", "Attribute-based Lists"),
-        ("gen-lic-list", "LicenseListGenerator", "License-based Lists"),
-    ]
-    
-    # Generate all lists
-    total_generators = len(generators)
-    for i, (module_name, class_name, description) in enumerate(generators, 1):
-        print(f"\n[{i}/{total_generators}] {description}")
-        print("-" * 50)
-        
-        try:
-            generator_class = import_generator(module_name, class_name)
-            generator = generator_class(config)
-            generator.generate()
-            print(f"✓ {description} generated successfully")
-        except Exception as e:
-            print(f"✗ Error generating {description}: {e}")
-            sys.exit(1)
-    
+
+    # Parse every declared input once up front, workers then load the parsed parts from the .cache pickles
+    dataset = Dataset(config)
+    for part in sorted({part for generator in GENERATORS for part in generator[3]}):
+        getattr(dataset, part)
+
+    # Rerun only generators whose fields, inputs, code or outputs on disk changed since the last successful run
+    snapshot = {'dataset': dataset.snapshot(), 'sources': {generator[0]: source_digest(generator[0]) for generator in GENERATORS}}
+    plan = plan_generators(snapshot, None if args.full else load_snapshot())
+    for module_name, class_name, description, _, _ in GENERATORS:
+        if module_name not in plan:
+            print(f"- {description}: inputs unchanged, skipped")
+        elif plan[module_name].get('only') is not None:
+            print(f"- {description}: only {', '.join(sorted(plan[module_name]['only'])) or 'nothing'}")
+
+    deps = dependencies(GENERATORS)
+    pending = {generator[0]: generator for generator in GENERATORS if generator[0] in plan}
+    done, failed, results = {generator[0] for generator in GENERATORS if generator[0] not in plan}, [], {}
+    total_generators = len(pending)
+
+    # One process per generator (max_tasks_per_child=1), so peak RSS is measured per generator
+    pool = None
+    if args.jobs > 1:
+        context = multiprocessing.get_context('spawn')
+        pool = ProcessPoolExecutor(max_workers=args.jobs, mp_context=context, max_tasks_per_child=1)
+    try:
+        running = {}
+        while pending or running:
+            for module_name in [name for name in pending if deps[name] <= done]:
+                _, class_name, description, _, _ = pending.pop(module_name)
+                if pool is None:
+                    future = run_inline(module_name, class_name, config, dataset, plan[module_name])
+                else:
+                    future = pool.submit(run_generator, module_name, class_name, config, None, plan[module_name])
+                running[future] = (module_name, description)
+            if not running:  # remaining generators wait on failed ones
+                for module_name, generator in pending.items():
+                    failed.append(generator[2])
+                    print(f"✗ Skipped {generator[2]}: depends on failed {', '.join(sorted(deps[module_name] - done))}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in [future for future in running if future in finished]:  # in submission order
+                module_name, description = running.pop(future)
+                print(f"\n[{len(results) + 1}/{total_generators}] {description}")
+                print("-" * 50)
+                try:
+                    ok, error, log, seconds, rss, changed, unchanged = future.result()
+                except Exception as e:  # worker crashed
+                    ok, error, log, seconds, rss, changed, unchanged = False, str(e), '', 0.0, 0.0, 0, 0
+                print(log, end='')
+                results[module_name] = (description, ok, seconds, rss, changed, unchanged)
+                if ok:
+                    done.add(module_name)
+                    print(f"✓ {description} generated successfully")
+                else:
+                    failed.append(description)
+                    print(f"✗ Error generating {description}: {error}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
     # Summary
     end_time = time.time()
     elapsed = end_time - start_time
-    
+
     print("\n" + "=" * 70)
     print("Generation Summary")
     print("=" * 70)
-    print(f"Total generators: {total_generators}")
+    print(f"{'Generator':<28} {'Status':<6} {'Wall':>7} {'Peak RSS':>10} {'Changed':>8} {'Same':>6}")
+    for module_name, (description, ok, seconds, rss, changed, unchanged) in results.items():
+        print(f"{description:<28} {'ok' if ok else 'FAIL':<6} {seconds:6.2f}s {rss:7.1f} MiB {changed:>8} {unchanged:>6}")
+    print(f"Total generators: {total_generators} run, {len(GENERATORS) - total_generators} skipped")
     print(f"Time elapsed: {elapsed:.2f} seconds")
+    print(f"Output files: {sum(r[4] for r in results.values())} changed, {sum(r[5] for r in results.values())} unchanged")
+    if failed:
+        print(f"{len(failed)} generator(s) failed: {', '.join(failed)}")
+        print("=" * 70)
+        sys.exit(1)
+    save_snapshot(snapshot)
     print("All extension list pages generated successfully!")
     print("=" * 70)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -14,17 +14,20 @@ from typing import Dict, List
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from common_utils import (
-    Config, DataLoader, TableGenerator,
-    write_content, build_leading_map
+    Config, Dataset, TABLE_FIELDS, TableGenerator,
+    write_content
 )
 
 
 class AttributeListGenerator:
     """Generate attribute-based extension list."""
     
-    def __init__(self, config: Config = None):
+    # Extension fields read by this generator, used by gen-all-list for incremental regeneration
+    FIELDS = TABLE_FIELDS | {'need_load', 'need_ddl', 'requires'}
+    
+    def __init__(self, config: Config = None, dataset: Dataset = None):
         self.config = config or Config()
-        self.data_loader = DataLoader(self.config)
+        self.dataset = dataset or Dataset(self.config)
         self.extensions = []
         self.table_gen = None
     
@@ -33,10 +36,10 @@ class AttributeListGenerator:
         print("Generating attribute list...")
         
         # Load data
-        self.extensions = self.data_loader.load_extensions()
+        self.extensions = self.dataset.extensions
         
         # Build leading extension map
-        leading_map = build_leading_map(self.extensions)
+        leading_map = self.dataset.leading_map
         self.table_gen = TableGenerator(leading_map)
         
         # Generate English version
@@ -184,9 +187,8 @@ No extensions with dependencies found.'''
         for ext in has_dependency_extensions:
             dependency_links = []
             for dep in ext.requires:
-                # Try to find the dependency extension to create proper links
-                dep_ext = next((e for e in self.extensions if e.name == dep), None)
-                if dep_ext:
+                # Link the dependency if it is a known extension
+                if dep in self.dataset.dependencies:
                     dependency_links.append(f'[`{dep}`](/e/{dep})')
                 else:
                     dependency_links.append(f'`{dep}`')
@@ -224,9 +226,8 @@ Extensions that have dependencies on other extensions.
         for ext in has_dependency_extensions:
             dependency_links = []
             for dep in ext.requires:
-                # Try to find the dependency extension to create proper links
-                dep_ext = next((e for e in self.extensions if e.name == dep), None)
-                if dep_ext:
+                # Link the dependency if it is a known extension
+                if dep in self.dataset.dependencies:
                     dependency_links.append(f'[`{dep}`](/zh/e/{dep})')
                 else:
                     dependency_links.append(f'`{dep}`')
@@ -18,34 +18,38 @@ from typing import Dict, List
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from common_utils import (
-    Config, DataLoader, TableGenerator, BadgeFormatter,
-    write_content, build_leading_map
+    Config, Dataset, ExtensionDetail, TABLE_FIELDS, TableGenerator, BadgeFormatter,
+    write_content, write_output
 )
 
 
 class CategoryIndexGenerator:
     """Generate individual category index pages."""
     
-    def __init__(self, config: Config = None):
+    # Extension fields read by this generator, used by gen-all-list for incremental regeneration
+    FIELDS = TABLE_FIELDS | {'category', 'version', 'rpm_pkg', 'deb_pkg', 'url', 'lang', 'license',
+                             'need_load', 'need_ddl', 'has_lib', 'trusted', 'contrib', 'repo'}
+    
+    def __init__(self, config: Config = None, dataset: Dataset = None):
         self.config = config or Config()
-        self.data_loader = DataLoader(self.config)
+        self.dataset = dataset or Dataset(self.config)
         self.extensions = []
         self.categories = {}
         self.table_gen = None
         self.badge_formatter = BadgeFormatter()
         self.matrix_data = None
         
-    def generate(self):
-        """Generate all category index pages."""
+    def generate(self, only=None):
+        """Generate all category index pages, or only those of the given category codes."""
         print("Generating category index pages...")
         
         # Load data
-        self.extensions = self.data_loader.load_extensions()
-        self.categories = self.data_loader.load_categories()
+        self.extensions = self.dataset.extensions
+        self.categories = self.dataset.categories
         self.matrix_data = self._load_matrix_data()
         
         # Build leading extension map
-        leading_map = build_leading_map(self.extensions)
+        leading_map = self.dataset.leading_map
         self.table_gen = TableGenerator(leading_map)
         
         # Group extensions by category
@@ -55,6 +59,8 @@ class CategoryIndexGenerator:
         
         # Generate a page for each category
         for category_code, category_obj in self.categories.items():
+            if only is not None and category_code not in only:
+                continue
             if category_code not in category_groups:
                 print(f"Warning: No extensions found for category {category_code}")
                 continue
@@ -62,6 +68,7 @@ class CategoryIndexGenerator:
             cat_extensions = sorted(category_groups[category_code], key=lambda e: e.id)
             self._generate_category_page(category_code, category_obj, cat_extensions)
         
+        self.dataset.details.save()
         print("Category index generation complete!")
     
     def _generate_category_page(self, category_code: str, category_obj, extensions: List):
@@ -133,15 +140,11 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         
         # English version
         en_path = os.path.join(category_dir, 'index.mdx')
-        with open(en_path, 'w', encoding='utf-8') as f:
-            f.write(en_content)
-        print(f"Generated: {en_path}")
+        write_output(en_path, en_content)
         
         # Chinese version
         zh_path = os.path.join(category_dir, 'index.zh.mdx')
-        with open(zh_path, 'w', encoding='utf-8') as f:
-            f.write(zh_content)
-        print(f"Generated: {zh_path}")
+        write_output(zh_path, zh_content)
     
     def _generate_extension_callouts(self, extensions: List, is_chinese: bool = False) -> str:
         """Generate detailed callouts for each extension, matching the format in content/docs/cate/time/index.mdx."""
@@ -149,16 +152,16 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         
         for ext in extensions:
             # Load extension details from data/ext/{name}.json
-            ext_data = self._load_extension_data(ext.name)
+            detail = self.dataset.details.get(ext.name)
             
             # Generate version info
-            version = ext.version or ext_data.get('version', 'Unknown')
+            version = ext.version or detail.version
             
             # Generate callout
             if is_chinese:
-                callout = self._generate_chinese_callout(ext, ext_data, version)
+                callout = self._generate_chinese_callout(ext, detail, version)
             else:
-                callout = self._generate_english_callout(ext, ext_data, version)
+                callout = self._generate_english_callout(ext, detail, version)
             
             callouts.append(callout)
         
@@ -168,21 +171,10 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         """Load matrix data - no longer needed since we use individual extension data."""
         return {}
     
-    def _load_extension_data(self, ext_name: str) -> Dict:
-        """Load extension data from JSON file."""
-        ext_file = os.path.join(self.config.DATA_DIR, 'ext', f'{ext_name}.json')
-        if os.path.exists(ext_file):
-            try:
-                with open(ext_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {}
-    
-    def _generate_english_callout(self, ext, ext_data: Dict, version: str) -> str:
+    def _generate_english_callout(self, ext, detail: ExtensionDetail, version: str) -> str:
         """Generate English callout for an extension, matching time/index.mdx format."""
         # Get basic info
-        website = ext_data.get('web', ext.url or '#')
+        website = detail.web or ext.url or '#'
         rpm_pkg = ext.rpm_pkg or f'{ext.pkg}_$v*'
         deb_pkg = ext.deb_pkg or f'postgresql-$v-{ext.pkg.replace("_", "-")}'
         description = ext.en_desc or ext.description or 'No description'
@@ -213,10 +205,10 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
     </div>
 </Callout>'''
     
-    def _generate_chinese_callout(self, ext, ext_data: Dict, version: str) -> str:
+    def _generate_chinese_callout(self, ext, detail: ExtensionDetail, version: str) -> str:
         """Generate Chinese callout for an extension, matching time/index.mdx format."""
         # Get basic info
-        website = ext_data.get('web', ext.url or '#')
+        website = detail.web or ext.url or '#'
         rpm_pkg = ext.rpm_pkg or f'{ext.pkg}_$v*'
         deb_pkg = ext.deb_pkg or f'postgresql-$v-{ext.pkg.replace("_", "-")}'
         description = ext.zh_desc or ext.en_desc or ext.description or '暂无描述'
@@ -249,10 +241,10 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
     
     def _generate_availability_matrix_from_data(self, ext_name: str) -> str:
         """Generate availability matrix table using extension data from data/ext/{name}.json."""
-        ext_data = self._load_extension_data(ext_name)
+        detail = self.dataset.details.get(ext_name)
         
         # Check if this is a CONTRIB extension
-        is_contrib = ext_data.get('contrib', False) or ext_data.get('repo', '').upper() == 'CONTRIB'
+        is_contrib = detail.contrib
         
         # Generate table header
         table_lines = ["            | OS/Arch | x86_64 | aarch64 |", "|:-----:|:---:|:---:|"]
@@ -264,20 +256,16 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
             for pg_ver in ['18', '17', '16', '15', '14']:
                 if is_contrib:
                     # For CONTRIB extensions, use pg_ver field to determine availability
-                    pg_versions = ext_data.get('pg_ver', [])
-                    if str(pg_ver) in [str(v) for v in pg_versions]:
+                    if str(pg_ver) in detail.pg_ver:
                         x86_badges.append(f'<Badge variant="green-subtle">{pg_ver}</Badge>')
                         arm_badges.append(f'<Badge variant="green-subtle">{pg_ver}</Badge>')
                     else:
                         x86_badges.append(f'<Badge variant="red-subtle">{pg_ver}</Badge>')
                         arm_badges.append(f'<Badge variant="red-subtle">{pg_ver}</Badge>')
                 else:
-                    # For non-CONTRIB extensions, use matrix data
-                    matrix_data = ext_data.get('matrix', [])
-                    
-                    # Find matching entries for this PG version and OS/arch combination
-                    x86_info = self._find_matrix_entry(matrix_data, pg_ver, os_code, 'x86_64')
-                    arm_info = self._find_matrix_entry(matrix_data, pg_ver, os_code, 'aarch64')
+                    # For non-CONTRIB extensions, use the per (os, pg) matrix state
+                    x86_info = detail.availability.get(ext_name, f'{os_code}.x86_64', pg_ver)
+                    arm_info = detail.availability.get(ext_name, f'{os_code}.aarch64', pg_ver)
                     
                     x86_badges.append(self._get_availability_badge_from_matrix(x86_info, pg_ver))
                     arm_badges.append(self._get_availability_badge_from_matrix(arm_info, pg_ver))
@@ -288,15 +276,6 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         
         return '\n'.join(table_lines)
     
-    def _find_matrix_entry(self, matrix_data: List[Dict], pg_ver: str, os_code: str, os_arch: str) -> Dict:
-        """Find matrix entry for specific PG version, OS code and architecture."""
-        for entry in matrix_data:
-            if (str(entry.get('pg', '')) == str(pg_ver) and 
-                entry.get('os_code', '') == os_code and 
-                entry.get('os_arch', '') == os_arch):
-                return entry
-        return {}
-    
     def _get_availability_badge_from_matrix(self, matrix_entry: Dict, pg_ver: str) -> str:
         """Generate availability badge from matrix entry with repository-based colors."""
         # If no matrix entry found, treat as missing (red)
@@ -352,9 +331,7 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         }
         
         en_meta_path = os.path.join(category_dir, 'meta.json')
-        with open(en_meta_path, 'w', encoding='utf-8') as f:
-            json.dump(en_meta, f, indent=2, ensure_ascii=False)
-        print(f"Generated: {en_meta_path}")
+        write_output(en_meta_path, json.dumps(en_meta, indent=2, ensure_ascii=False))
         
         # Generate Chinese meta.zh.json
         zh_meta = {
@@ -362,9 +339,7 @@ import {{ Clock, Globe, Brain, Search, ChartNoAxesCombined, Sparkles, BookA, Box
         }
         
         zh_meta_path = os.path.join(category_dir, 'meta.zh.json')
-        with open(zh_meta_path, 'w', encoding='utf-8') as f:
-            json.dump(zh_meta, f, indent=2, ensure_ascii=False)
-        print(f"Generated: {zh_meta_path}")
+        write_output(zh_meta_path, json.dumps(zh_meta, indent=2, ensure_ascii=False))
 
 
 def main():
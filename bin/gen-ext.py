@@ -1,18 +1,52 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import json
+import time
+import glob
+import argparse
+import tempfile
 import psycopg2
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from datetime import datetime, date
 
-# Database connection
-CONN = psycopg2.connect('postgres:///vonng')
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common_utils import OutputWriter, get_output_writer
+
+# Database connection, opened by main()
+CONN = None
 
 # Directories
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, '..', 'data', 'ext'))
 
+# Column lists of the exported tables, shared by the per-extension and bulk paths
+EXTENSION_COLUMNS = [
+    'id', 'name', 'pkg', 'lead_ext', 'category', 'state', 'url', 'license', 'tags', 'version', 'repo', 'lang',
+    'contrib', 'lead', 'has_bin', 'has_lib', 'need_ddl', 'need_load', 'trusted', 'relocatable', 'schemas',
+    'pg_ver', 'requires', 'require_by', 'see_also', 'rpm_ver', 'rpm_repo', 'rpm_pkg', 'rpm_pg', 'rpm_deps',
+    'deb_ver', 'deb_repo', 'deb_pkg', 'deb_deps', 'deb_pg', 'source', 'extra', 'en_desc', 'zh_desc', 'comment', 'mtime'
+]
+EXTENSION_ARRAY_FIELDS = ['tags', 'schemas', 'pg_ver', 'requires', 'require_by', 'see_also', 'rpm_pg', 'rpm_deps', 'deb_pg', 'deb_deps']
+MATRIX_COLUMNS = ['pg', 'os', 'type', 'os_code', 'os_arch', 'pkg', 'ext', 'pname', 'miss', 'hide', 'pkg_repo', 'pkg_ver', 'count']
+AVAILABILITY_COLUMNS = ['pkg', 'ext', 'pname', 'os', 'pg', 'name', 'ver', 'org', 'type', 'os_code', 'os_arch', 'repo',
+                        'version', 'release', 'file', 'sha256', 'url', 'mirror_url', 'size', 'size_full']
+
+EXTENSION_SQL = f"SELECT {', '.join(EXTENSION_COLUMNS)} FROM pgext.extension"
+MATRIX_SQL = f"SELECT {', '.join(MATRIX_COLUMNS)} FROM pgext.matrix"
+AVAILABILITY_SQL = f"SELECT {', '.join(AVAILABILITY_COLUMNS)} FROM pgext.availability"
+
+# Rows fetched per round trip by the bulk export server-side cursors
+BULK_ITERSIZE = 5000
+
 def parse_array(value: str) -> List[str]:
     """Parse PostgreSQL array string to Python list."""
     if isinstance(value, list):
@@ -23,45 +57,64 @@ def parse_array(value: str) -> List[str]:
 
 def serialize_date(obj):
     """JSON serializer for dates."""
-    from datetime import datetime, date
     if isinstance(obj, (datetime, date)):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
+def dumps_json(data: Dict[str, Any], compact: bool = False) -> bytes:
+    """Serialize with the stdlib json module."""
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=serialize_date).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=serialize_date).encode('utf-8')
+
+def dumps_orjson(data: Dict[str, Any], compact: bool = False) -> bytes:
+    """Serialize with orjson, byte-identical to dumps_json for the exported data."""
+    return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+
+# Serializer backends, orjson is used when installed
+SERIALIZERS = {'json': dumps_json}
+if orjson is not None:
+    SERIALIZERS['orjson'] = dumps_orjson
+DEFAULT_SERIALIZER = 'orjson' if orjson is not None else 'json'
+
+# Output options, set by main()
+DUMPS = SERIALIZERS[DEFAULT_SERIALIZER]
+COMPACT = False
+
+def build_extension(row: tuple) -> Dict[str, Any]:
+    """Build extension dict from a pgext.extension row, with array fields parsed."""
+    ext_data = dict(zip(EXTENSION_COLUMNS, row))
+    if isinstance(ext_data['mtime'], (datetime, date)):  # pre-convert, so serializers need no default hook
+        ext_data['mtime'] = ext_data['mtime'].isoformat()
+    for field in EXTENSION_ARRAY_FIELDS:
+        if ext_data[field]:
+            ext_data[field] = parse_array(ext_data[field])
+        else:
+            ext_data[field] = []
+    return ext_data
+
+def build_package(row: tuple) -> Dict[str, Any]:
+    """Build compact package entry from a pgext.availability row."""
+    pkg_data = dict(zip(AVAILABILITY_COLUMNS, row))
+    return {
+        "os": pkg_data['os'],
+        "pg": pkg_data['pg'],
+        "name": pkg_data['name'],
+        "ver": pkg_data['ver'],
+        "file": pkg_data['file'],
+        "size": pkg_data['size'],
+        "url": pkg_data['url'],
+        "sha256": pkg_data['sha256']
+    }
+
 def get_extension_data(extension_name: str) -> Dict[str, Any]:
     """Get extension data from pgext.extension table."""
     with CONN.cursor() as cur:
-        cur.execute("""
-            SELECT id, name, pkg, lead_ext, category, state, url, license, tags, version, repo, lang, 
-                   contrib, lead, has_bin, has_lib, need_ddl, need_load, trusted, relocatable, schemas, 
-                   pg_ver, requires, require_by, see_also, rpm_ver, rpm_repo, rpm_pkg, rpm_pg, rpm_deps, 
-                   deb_ver, deb_repo, deb_pkg, deb_deps, deb_pg, source, extra, en_desc, zh_desc, comment, mtime
-            FROM pgext.extension WHERE name = %s
-        """, (extension_name,))
+        cur.execute(EXTENSION_SQL + " WHERE name = %s", (extension_name,))
         row = cur.fetchone()
-        
         if not row:
             return None
-            
-        # Column names matching the query above
-        columns = [
-            'id', 'name', 'pkg', 'lead_ext', 'category', 'state', 'url', 'license', 'tags', 'version', 'repo', 'lang',
-            'contrib', 'lead', 'has_bin', 'has_lib', 'need_ddl', 'need_load', 'trusted', 'relocatable', 'schemas',
-            'pg_ver', 'requires', 'require_by', 'see_also', 'rpm_ver', 'rpm_repo', 'rpm_pkg', 'rpm_pg', 'rpm_deps',
-            'deb_ver', 'deb_repo', 'deb_pkg', 'deb_deps', 'deb_pg', 'source', 'extra', 'en_desc', 'zh_desc', 'comment', 'mtime'
-        ]
-        
-        ext_data = dict(zip(columns, row))
-        
-        # Parse array fields
-        array_fields = ['tags', 'schemas', 'pg_ver', 'requires', 'require_by', 'see_also', 'rpm_pg', 'rpm_deps', 'deb_pg', 'deb_deps']
-        for field in array_fields:
-            if ext_data[field]:
-                ext_data[field] = parse_array(ext_data[field])
-            else:
-                ext_data[field] = []
-        
-        return ext_data
+        return build_extension(row)
 
 def get_siblings(pkg_name: str) -> List[str]:
     """Get all extensions in the same package (siblings)."""
@@ -72,42 +125,28 @@ def get_siblings(pkg_name: str) -> List[str]:
 def get_matrix_data(pkg_name: str) -> List[Dict[str, Any]]:
     """Get matrix data for the package."""
     with CONN.cursor() as cur:
-        cur.execute("""
-            SELECT pg, os, type, os_code, os_arch, pkg, ext, pname, miss, hide, pkg_repo, pkg_ver, count
-            FROM pgext.matrix WHERE pkg = %s ORDER BY pg DESC, os, type
-        """, (pkg_name,))
-        
-        columns = ['pg', 'os', 'type', 'os_code', 'os_arch', 'pkg', 'ext', 'pname', 'miss', 'hide', 'pkg_repo', 'pkg_ver', 'count']
-        return [dict(zip(columns, row)) for row in cur.fetchall()]
+        cur.execute(MATRIX_SQL + " WHERE pkg = %s ORDER BY pg DESC, os, type", (pkg_name,))
+        return [dict(zip(MATRIX_COLUMNS, row)) for row in cur.fetchall()]
 
 def get_availability_data(pkg_name: str) -> List[Dict[str, Any]]:
     """Get availability data for the package."""
     with CONN.cursor() as cur:
-        cur.execute("""
-            SELECT pkg, ext, pname, os, pg, name, ver, org, type, os_code, os_arch, repo, 
-                   version, release, file, sha256, url, mirror_url, size, size_full
-            FROM pgext.availability WHERE pkg = %s ORDER BY pkg, pname, os, pg
-        """, (pkg_name,))
-        
-        columns = ['pkg', 'ext', 'pname', 'os', 'pg', 'name', 'ver', 'org', 'type', 'os_code', 'os_arch', 'repo',
-                   'version', 'release', 'file', 'sha256', 'url', 'mirror_url', 'size', 'size_full']
-        
-        availability_data = []
-        for row in cur.fetchall():
-            pkg_data = dict(zip(columns, row))
-            # Create compact inline JSON object with required parameters
-            availability_data.append({
-                "os": pkg_data['os'],
-                "pg": pkg_data['pg'],
-                "name": pkg_data['name'],
-                "ver": pkg_data['ver'],
-                "file": pkg_data['file'],
-                "size": pkg_data['size'],
-                "url": pkg_data['url'],
-                "sha256": pkg_data['sha256']
-            })
-        
-        return availability_data
+        cur.execute(AVAILABILITY_SQL + " WHERE pkg = %s ORDER BY pkg, pname, os, pg, semver DESC NULLS LAST, vkey DESC, org DESC", (pkg_name,))
+        return [build_package(row) for row in cur.fetchall()]
+
+def write_extension_json(ext_data: Dict[str, Any], siblings: List[str], matrix_data: List[Dict[str, Any]],
+                         availability_data: List[Dict[str, Any]], output_dir: str = None,
+                         writer: OutputWriter = None) -> Tuple[str, bool]:
+    """Write the JSON file of a single extension if changed, return the output path and whether it was written."""
+    json_data = {
+        **ext_data,  # All extension fields
+        "siblings": siblings,
+        "matrix": matrix_data,
+        "package": availability_data
+    }
+    output_file = os.path.join(output_dir or OUTPUT_DIR, f"{ext_data['name']}.json")
+    content = DUMPS(json_data, COMPACT)
+    return output_file, (writer or get_output_writer()).write(output_file, content)
 
 def generate_extension_json(extension_name: str) -> None:
     """Generate JSON file for a single extension."""
@@ -128,46 +167,141 @@ def generate_extension_json(extension_name: str) -> None:
     # Get availability data  
     availability_data = get_availability_data(ext_data['pkg'])
     
-    # Build final JSON structure
-    json_data = {
-        **ext_data,  # All extension fields
-        "siblings": siblings,
-        "matrix": matrix_data,
-        "package": availability_data
-    }
-    
-    # Write to file
-    output_file = os.path.join(OUTPUT_DIR, f"{extension_name}.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, indent=2, ensure_ascii=False, default=serialize_date)
-    
-    print(f"  Generated: {output_file}")
+    output_file, written = write_extension_json(ext_data, siblings, matrix_data, availability_data)
+    print(f"  {'Generated' if written else 'Unchanged'}: {output_file}")
 
-def get_all_extensions() -> List[str]:
-    """Get all extension names."""
-    with CONN.cursor() as cur:
-        cur.execute("SELECT name FROM pgext.extension ORDER BY name")
-        return [row[0] for row in cur.fetchall()]
+def stream_by_pkg(name: str, sql: str, key: int, build) -> Iterator[Tuple[str, List[Any]]]:
+    """Stream (pkg, rows) groups from a named server-side cursor, sql must be ordered by pkg COLLATE "C"."""
+    with CONN.cursor(name=name) as cur:
+        cur.itersize = BULK_ITERSIZE
+        cur.execute(sql)
+        for pkg, rows in groupby(cur, key=lambda row: row[key]):
+            yield pkg, [build(row) for row in rows]
+
+class PkgGroups:
+    """Merge cursor over a pkg-ordered group stream, skipping pkgs that were never asked for."""
+
+    def __init__(self, groups: Iterator[Tuple[str, List[Any]]]):
+        self.groups = groups
+        self.head = next(groups, None)
+
+    def take(self, pkg: str) -> List[Any]:
+        """Return rows of the given pkg, pkgs must be asked for in ascending order."""
+        while self.head is not None and self.head[0] < pkg:
+            self.head = next(self.groups, None)
+        if self.head is None or self.head[0] != pkg:
+            return []
+        rows = self.head[1]
+        self.head = next(self.groups, None)
+        return rows
+
+def generate_all_json(jobs: int = 1) -> int:
+    """Generate JSON files for all extensions from three streaming queries, return file count."""
+    # C collation keeps the database pkg order identical to python string comparison
+    extensions = stream_by_pkg('extension', EXTENSION_SQL + ' ORDER BY pkg COLLATE "C", name', 2, build_extension)
+    matrix = PkgGroups(stream_by_pkg('matrix', MATRIX_SQL + ' ORDER BY pkg COLLATE "C", pg DESC, os, type', 5,
+                                     lambda row: dict(zip(MATRIX_COLUMNS, row))))
+    availability = PkgGroups(stream_by_pkg('availability', AVAILABILITY_SQL +
+                                           ' ORDER BY pkg COLLATE "C", pname, os, pg, semver DESC NULLS LAST, vkey DESC, org DESC',
+                                           0, build_package))
+
+    def documents():
+        for pkg, exts in extensions:
+            siblings = [ext['name'] for ext in exts]
+            matrix_data = matrix.take(pkg)
+            availability_data = availability.take(pkg)
+            for ext_data in exts:
+                yield ext_data, siblings, matrix_data, availability_data
+
+    count = write_all_json(documents(), jobs)
+    CONN.commit()  # close the server-side cursor transaction
+    return count
+
+def write_all_json(documents, jobs: int = 1, output_dir: str = None, writer: OutputWriter = None) -> int:
+    """Serialize and write (ext_data, siblings, matrix, package) documents on a thread pool, return file count."""
+    count = 0
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        futures = [(doc[0]['name'], pool.submit(write_extension_json, *doc, output_dir, writer)) for doc in documents]
+        for name, future in futures:
+            try:
+                future.result()
+                count += 1
+            except Exception as e:
+                print(f"Error processing {name}: {e}")
+    return count
+
+def load_documents(scale: int = 1) -> List[Tuple]:
+    """Load the current data/ext files as export documents, replicated `scale` times under synthetic names."""
+    documents = []
+    for path in sorted(glob.glob(os.path.join(OUTPUT_DIR, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        siblings, matrix_data, availability_data = data.pop('siblings'), data.pop('matrix'), data.pop('package')
+        for i in range(scale):
+            ext_data = data if i == 0 else {**data, 'name': f"{data['name']}_{i}"}
+            documents.append((ext_data, siblings, matrix_data, availability_data))
+    return documents
+
+def bench(jobs: int, rounds: int = 3):
+    """Benchmark serializers and writer threads on the current data/ext dataset and a synthetic 10x one."""
+    global DUMPS, COMPACT
+    for scale in (1, 10):
+        documents = load_documents(scale)
+        print(f"Dataset x{scale}: {len(documents)} files")
+        baseline = None
+        for name in SERIALIZERS:
+            for compact in (False, True):
+                for threads in sorted({1, jobs}):
+                    DUMPS, COMPACT = SERIALIZERS[name], compact
+                    best, size = None, 0
+                    for _ in range(rounds):
+                        with tempfile.TemporaryDirectory() as tmp:
+                            writer = OutputWriter(os.path.join(tmp, 'manifest.json'))
+                            start = time.perf_counter()
+                            write_all_json(documents, threads, tmp, writer)
+                            elapsed = time.perf_counter() - start
+                            size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(tmp, '*.json')))
+                        best = elapsed if best is None else min(best, elapsed)
+                    baseline = baseline or best
+                    print(f"  {name:<7} {'compact' if compact else 'indent2':<8} threads={threads:<3} "
+                          f"{best:7.3f}s {size / 1048576:8.1f} MiB  x{baseline / best:.2f}")
 
 def main():
-    """Main function to generate all extension JSON files."""
+    """Main function to generate extension JSON files, all in bulk or the given ones."""
+    global CONN, DUMPS, COMPACT
+    parser = argparse.ArgumentParser(description="Generate data/ext/*.json from the pgext database")
+    parser.add_argument('extensions', nargs='*', help="extension names to regenerate, all in bulk if omitted")
+    parser.add_argument('--pgurl', default='postgres:///vonng', help="PostgreSQL connection URL")
+    parser.add_argument('--serializer', choices=sorted(SERIALIZERS), default=DEFAULT_SERIALIZER, help="JSON serializer backend")
+    parser.add_argument('--compact', action='store_true', help="write minified JSON instead of 2-space indented")
+    parser.add_argument('--jobs', type=int, default=min(8, os.cpu_count() or 1), help="writer threads for bulk export")
+    parser.add_argument('--bench', action='store_true', help="benchmark serializers on the current data/ext files, no database")
+    args = parser.parse_args()
+
+    DUMPS, COMPACT = SERIALIZERS[args.serializer], args.compact
+    if args.bench:
+        bench(args.jobs)
+        return
+
     print("Generating extension JSON files...")
+    CONN = psycopg2.connect(args.pgurl)
     
     # Ensure output directory exists
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    # Get all extensions
-    extensions = get_all_extensions()
-    print(f"Found {len(extensions)} extensions to process")
-    
-    # Generate JSON for each extension
-    for ext_name in extensions:
-        try:
-            generate_extension_json(ext_name)
-        except Exception as e:
-            print(f"Error processing {ext_name}: {e}")
+    # Regenerate the given extensions one by one
+    if args.extensions:
+        print(f"Found {len(args.extensions)} extensions to process")
+        for ext_name in args.extensions:
+            try:
+                generate_extension_json(ext_name)
+            except Exception as e:
+                print(f"Error processing {ext_name}: {e}")
+    else:
+        count = generate_all_json(args.jobs)
+        print(f"Generated {count} extension files")
     
-    print(f"JSON generation complete! Files generated in {OUTPUT_DIR}")
+    print(f"JSON generation complete! Files in {OUTPUT_DIR}: {get_output_writer().summary()}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -14,17 +14,20 @@ from typing import Dict, List
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from common_utils import (
-    Config, DataLoader, TableGenerator, BadgeFormatter, 
-    LANGUAGE_DESCRIPTIONS, LANGUAGE_CONFIG, write_content, build_leading_map
+    Config, Dataset, TABLE_FIELDS, TableGenerator, BadgeFormatter, 
+    LANGUAGE_DESCRIPTIONS, LANGUAGE_CONFIG, write_content
 )
 
 
 class LanguageListGenerator:
     """Generate language-based extension list."""
     
-    def __init__(self, config: Config = None):
+    # Extension fields read by this generator, used by gen-all-list for incremental regeneration
+    FIELDS = TABLE_FIELDS | {'lang'}
+    
+    def __init__(self, config: Config = None, dataset: Dataset = None):
         self.config = config or Config()
-        self.data_loader = DataLoader(self.config)
+        self.dataset = dataset or Dataset(self.config)
         self.extensions = []
         self.table_gen = None
     
@@ -33,10 +36,10 @@ class LanguageListGenerator:
         print("Generating language list...")
         
         # Load data
-        self.extensions = self.data_loader.load_extensions()
+        self.extensions = self.dataset.extensions
         
         # Build leading extension map
-        leading_map = build_leading_map(self.extensions)
+        leading_map = self.dataset.leading_map
         self.table_gen = TableGenerator(leading_map)
         
         # Generate English version
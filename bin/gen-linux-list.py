@@ -9,7 +9,6 @@ Generates content/docs/list/linux.mdx and content/docs/list/linux.zh.mdx
 
 import os
 import sys
-import json
 from collections import defaultdict
 from typing import Dict, List, Set, Tuple
 from dataclasses import dataclass
@@ -18,8 +17,8 @@ from dataclasses import dataclass
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from common_utils import (
-    Config, DataLoader, TableGenerator,
-    write_content, build_leading_map
+    Config, Dataset, TABLE_FIELDS, TableGenerator,
+    write_content
 )
 
 
@@ -37,9 +36,12 @@ class ExtensionAvailability:
 class LinuxListGenerator:
     """Generate Linux distribution-based extension list."""
     
-    def __init__(self, config: Config = None):
+    # Extension fields read by this generator, used by gen-all-list for incremental regeneration
+    FIELDS = TABLE_FIELDS | {'repo'}
+    
+    def __init__(self, config: Config = None, dataset: Dataset = None):
         self.config = config or Config()
-        self.data_loader = DataLoader(self.config)
+        self.dataset = dataset or Dataset(self.config)
         self.extensions = []
         self.table_gen = None
         
@@ -73,10 +75,10 @@ class LinuxListGenerator:
         print("Generating Linux distribution availability analysis...")
         
         # Load extension data
-        self.extensions = self.data_loader.load_extensions()
+        self.extensions = self.dataset.extensions
         
         # Build leading extension map
-        leading_map = build_leading_map(self.extensions)
+        leading_map = self.dataset.leading_map
         self.table_gen = TableGenerator(leading_map)
         
         # Analyze availability across distributions
@@ -90,46 +92,15 @@ class LinuxListGenerator:
         
         print("Linux distribution analysis complete!")
     
-    def _load_extension_matrix_data(self) -> Dict[str, List[Dict]]:
-        """Load extension availability data from JSON files in data/ext/."""
-        ext_dir = os.path.join(self.config.DATA_DIR, 'ext')
-        if not os.path.exists(ext_dir):
-            print(f"Warning: {ext_dir} not found")
-            return {}
-        
-        extension_data = {}
-        
-        for filename in os.listdir(ext_dir):
-            if not filename.endswith('.json'):
-                continue
-                
-            ext_name = filename[:-5]  # Remove .json suffix
-            filepath = os.path.join(ext_dir, filename)
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'matrix' in data:
-                        extension_data[ext_name] = {
-                            'matrix': data['matrix'],
-                            'pkg': data.get('pkg', ext_name)
-                        }
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not read {filepath}: {e}")
-                continue
-                
-        print(f"Loaded matrix data for {len(extension_data)} extensions")
-        return extension_data
-        
     def _analyze_linux_availability(self) -> Dict[str, List]:
         """Analyze extension availability across Linux platforms, excluding Contrib extensions."""
-        extension_data = self._load_extension_matrix_data()
+        availability = self.dataset.availability
         
         # Filter out Contrib extensions
         filtered_extensions = []
         for ext in self.extensions:
             if ext.repo != 'CONTRIB':  # Exclude contrib extensions
-                if ext.name in extension_data:
+                if ext.name in availability:
                     filtered_extensions.append(ext)
         
         platform_analysis = {}
@@ -138,36 +109,9 @@ class LinuxListGenerator:
             missing_or_flawed = []
             
             for ext in filtered_extensions:
-                ext_data = extension_data[ext.name]
-                matrix = ext_data['matrix']
-                
-                # Find matrix entry for this platform
-                platform_entry = None
-                for entry in matrix:
-                    if f"{entry.get('os_code')}.{entry.get('os_arch')}" == platform:
-                        platform_entry = entry
-                        break
-                
-                # Check if extension is missing or has issues on this platform
-                is_problematic = False
-                availability_status = {}
-                
-                if not platform_entry:
-                    # No entry found - completely missing
-                    is_problematic = True
-                    for pg_ver in self.pg_versions:
-                        availability_status[pg_ver] = 'missing'
-                else:
-                    # Check for each PostgreSQL version
-                    for pg_ver in self.pg_versions:
-                        if platform_entry.get('miss', False) or platform_entry.get('hide', False):
-                            availability_status[pg_ver] = 'missing'
-                            is_problematic = True
-                        elif platform_entry.get('warn', False):
-                            availability_status[pg_ver] = 'warning'
-                            is_problematic = True
-                        else:
-                            availability_status[pg_ver] = 'available'
+                # Check if extension is missing or has issues on this platform, per PostgreSQL version
+                availability_status = {pg_ver: availability.status(ext.name, platform, pg_ver) for pg_ver in self.pg_versions}
+                is_problematic = any(status != 'available' for status in availability_status.values())
                 
                 if is_problematic:
                     missing_or_flawed.append({
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 
 import os
-import psycopg2
 import re
+from bisect import bisect_left
 from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict, Counter
 from dataclasses import dataclass
@@ -219,6 +219,49 @@ class Package:
         return cls(*row)
 
 
+class PackageIndex:
+    """Packages keyed by name and pname, looked up with an extension's own rpm_pkg / deb_pkg template."""
+    
+    def __init__(self, packages: List[Package]):
+        self.packages = packages
+        self.pg_versions = sorted({pkg.pg for pkg in packages}, reverse=True)
+        self.positions = defaultdict(list)  # name or pname -> positions in packages
+        for pos, pkg in enumerate(packages):
+            self.positions[pkg.name].append(pos)
+            if pkg.pname != pkg.name:
+                self.positions[pkg.pname].append(pos)
+        self.names = sorted(self.positions)  # for prefix lookups of glob templates
+    
+    @staticmethod
+    def template(pkg_spec: Optional[str]) -> Optional[str]:
+        """Name template of an rpm_pkg / deb_pkg spec: the first package, e.g. pg_cron_$v* or postgresql$v-contrib."""
+        if not pkg_spec:
+            return None
+        return pkg_spec.split(' ')[0]
+    
+    def _find(self, name: str) -> List[int]:
+        """Positions of packages named name, or prefixed by it for a name ending with '*'."""
+        if not name.endswith('*'):
+            return self.positions.get(name, [])
+        prefix, found = name.rstrip('*'), []
+        for key in self.names[bisect_left(self.names, prefix):]:
+            if not key.startswith(prefix):
+                break
+            found.extend(self.positions[key])
+        return found
+    
+    def lookup(self, *templates: Optional[str]) -> List[Package]:
+        """Packages matching any of the templates with $v as each PG major, in their original order."""
+        found = set()
+        for template in dict.fromkeys(t for t in templates if t):
+            if '$v' not in template:
+                found.update(self._find(template))
+                continue
+            for pg in self.pg_versions:
+                found.update(self._find(template.replace('$v', str(pg))))
+        return [self.packages[pos] for pos in sorted(found)]
+
+
 @dataclass
 class Extension:
     """Represents a PostgreSQL extension with all its metadata."""
@@ -304,20 +347,10 @@ class Extension:
     def has_deb(self) -> bool:
         return bool(self.deb_repo)
     
-    def load_packages(self, all_packages: List[Package]):
-        """Load package data for this extension from the provided list."""
-        if self.packages is None:
-            self.packages = []
-        
-        # Find packages that match this extension's package name
-        for pkg in all_packages:
-            # Handle different package naming patterns:
-            # RPM: pkg_name, pkg_name_XX (where XX is PG version)
-            # DEB: postgresql-XX-pkg-name (where XX is PG version)
-            if (pkg.pname == self.pkg or 
-                pkg.pname.startswith(f'{self.pkg}_') or
-                f'-{self.pkg.replace("_", "-")}' in pkg.pname):
-                self.packages.append(pkg)
+    def load_packages(self, index: PackageIndex):
+        """Load package data for this extension from the package index."""
+        # Same naming rule as pgext.matrix: the first rpm_pkg / deb_pkg entry with $v as PG major
+        self.packages = index.lookup(PackageIndex.template(self.rpm_pkg), PackageIndex.template(self.deb_pkg))
 
 
 # =============================================================================
@@ -423,6 +456,34 @@ class TableGenerator:
         separator_row = '|' + '|'.join(alignments) + '|'
         return header_row + '\n' + separator_row
     
+    def generate_availability_matrix(self, ext: Extension, config, is_chinese=False) -> str:
+        """Generate right-side availability matrix with PG version badges."""
+        # Packages are already loaded in _setup, ordered by os, pg: the last one per cell wins
+        pkg_matrix = {}
+        for pkg in ext.packages:
+            pkg_matrix[(f"{pkg.os_code}.{normalize_os_arch(pkg.os_arch)}", pkg.pg)] = (pkg.version, pkg.org.upper())
+        
+        def badge(os_key: str, pg: int) -> str:
+            version, repo = pkg_matrix.get((os_key, pg), (None, None))
+            if version:
+                variant = {'PIGSTY': 'amber-subtle', 'PGDG': 'blue-subtle', 'CONTRIB': 'green-subtle'}.get(repo, 'gray-subtle')
+            elif ext.contrib and str(pg) in ext.pg_ver:
+                variant = 'green-subtle'
+            else:
+                variant = 'red-subtle'
+            return f'<Badge variant="{variant}">{pg}</Badge>'
+        
+        # Generate matrix table, group by OS, then by architecture
+        rows = []
+        for os_base in ['el8', 'el9', 'd12', 'u22', 'u24']:
+            x86_badges = ''.join(badge(f"{os_base}.x86_64", pg) for pg in config.PG_VERSIONS)
+            arm_badges = ''.join(badge(f"{os_base}.aarch64", pg) for pg in config.PG_VERSIONS)
+            rows.append(f"| {os_base} | {x86_badges} | {arm_badges} |")
+
+        header_txt = '系统'  if is_chinese else 'OS/Arch'
+        header = f"| {header_txt} | x86_64 | aarch64 |\n|:-----:|:---:|:---:|"
+        return f"{header}\n" + "\n".join(rows)
+    
     def generate_extension_cards(self, extensions: List[Extension], config, is_chinese=False) -> str:
         """Generate Callout-style layout for extensions with detailed metadata."""
         if not extensions:
@@ -462,80 +523,6 @@ class TableGenerator:
 | {lang_label} | {format_language_badge(ext.lang or "N/A")} | {bin_badge} |
 | {lic_label} | {BadgeFormatter.format_license(ext.license or "N/A", is_chinese=False)} | {trust_badge} |'''
 
-        def generate_availability_matrix(ext: Extension) -> str:
-
-            """Generate right-side availability matrix with PG version badges."""
-            # Packages are already loaded in _setup
-            
-            # Build package matrix
-            pkg_matrix = {}
-            repo_matrix = {}
-            
-            # Initialize matrix for each OS
-            for os in config.OS_VERSIONS:
-                pkg_matrix[os] = {}
-                repo_matrix[os] = {}
-                for pg in config.PG_VERSIONS:
-                    pkg_matrix[os][pg] = ""
-                    repo_matrix[os][pg] = ""
-            
-            # Fill matrix with actual package data
-            for pkg in ext.packages:
-                pkg_os_key = f"{pkg.os_code}.{normalize_os_arch(pkg.os_arch)}"
-                
-                if pkg_os_key in pkg_matrix and pkg.pg in pkg_matrix[pkg_os_key]:
-                    pkg_matrix[pkg_os_key][pkg.pg] = pkg.version
-                    repo_matrix[pkg_os_key][pkg.pg] = pkg.org.upper()
-            
-            # Generate matrix table
-            rows = []
-            # Group by OS, then by architecture
-            for os_base in ['el8', 'el9', 'd12', 'u22', 'u24']:
-                x86_key = f"{os_base}.x86_64"
-                arm_key = f"{os_base}.aarch64"
-                
-                x86_badges = []
-                arm_badges = []
-                
-                for pg in config.PG_VERSIONS:
-                    # x86_64 badges
-                    if x86_key in pkg_matrix and pg in pkg_matrix[x86_key] and pkg_matrix[x86_key][pg]:
-                        repo = repo_matrix[x86_key][pg]
-                        if repo == 'PIGSTY':
-                            x86_badges.append(f'<Badge variant="amber-subtle">{pg}</Badge>')
-                        elif repo == 'PGDG':
-                            x86_badges.append(f'<Badge variant="blue-subtle">{pg}</Badge>')
-                        elif repo == 'CONTRIB':
-                            x86_badges.append(f'<Badge variant="green-subtle">{pg}</Badge>')
-                        else:
-                            x86_badges.append(f'<Badge variant="gray-subtle">{pg}</Badge>')
-                    elif ext.contrib and str(pg) in ext.pg_ver:
-                        x86_badges.append(f'<Badge variant="green-subtle">{pg}</Badge>')
-                    else:
-                        x86_badges.append(f'<Badge variant="red-subtle">{pg}</Badge>')
-                    
-                    # aarch64 badges
-                    if arm_key in pkg_matrix and pg in pkg_matrix[arm_key] and pkg_matrix[arm_key][pg]:
-                        repo = repo_matrix[arm_key][pg]
-                        if repo == 'PIGSTY':
-                            arm_badges.append(f'<Badge variant="amber-subtle">{pg}</Badge>')
-                        elif repo == 'PGDG':
-                            arm_badges.append(f'<Badge variant="blue-subtle">{pg}</Badge>')
-                        elif repo == 'CONTRIB':
-                            arm_badges.append(f'<Badge variant="green-subtle">{pg}</Badge>')
-                        else:
-                            arm_badges.append(f'<Badge variant="gray-subtle">{pg}</Badge>')
-                    elif ext.contrib and str(pg) in ext.pg_ver:
-                        arm_badges.append(f'<Badge variant="green-subtle">{pg}</Badge>')
-                    else:
-                        arm_badges.append(f'<Badge variant="red-subtle">{pg}</Badge>')
-                
-                rows.append(f"| {os_base} | {''.join(x86_badges)} | {''.join(arm_badges)} |")
-
-            header_txt = '系统'  if is_chinese else 'OS/Arch'
-            header = f"| {header_txt} | x86_64 | aarch64 |\n|:-----:|:---:|:---:|"
-            return f"{header}\n" + "\n".join(rows)
-
         callouts = []
         for ext in extensions:
             title = f"{ext.name} - {ext.version or 'Unknown'}"
@@ -548,7 +535,7 @@ class TableGenerator:
             {generate_metadata_table(ext)}
         </div>
         <div className="space-y-2">
-            {generate_availability_matrix(ext)}
+            {self.generate_availability_matrix(ext, config, is_chinese)}
         </div>
     </div>
 </Callout>
@@ -571,6 +558,7 @@ class DatabaseManager:
     
     def get_connection(self):
         if self._conn is None:
+            import psycopg2  # only needed once a connection is opened, the generators import without it
             self._conn = psycopg2.connect(self.connection_string)
         return self._conn
     
@@ -1521,8 +1509,9 @@ class ExtensionListGenerator:
         self.packages = self.db_manager.load_packages()
         
         # Load packages for all extensions
+        package_index = PackageIndex(self.packages)
         for ext in self.extensions:
-            ext.load_packages(self.packages)
+            ext.load_packages(package_index)
         
         # Build leading extension map
         self.leading_map = self._build_leading_map()
@@ -1,96 +1,305 @@
 #!/usr/bin/env python3
 
+import argparse
+import os
 import psycopg
 import sqlite3
-import json
-import re
-import io
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from psycopg.types.json import Jsonb
 
 PGURL = "postgres:///vonng"
 
-def reload_pkg(pgurl=PGURL):
+# Column types of pgext.yum / pgext.apt, for binary COPY
+YUM_TYPES = [
+    'text', 'int4', 'text', 'text', 'text', 'text', 'text', 'text', 'text', 'text',
+    'text', 'int4', 'int4', 'text', 'text', 'text', 'text', 'text', 'int4', 'int4',
+    'text', 'int4', 'int4', 'int4', 'text', 'text', 'text',
+]
+APT_TYPES = ['text', 'text', 'text', 'text', 'int4', 'int4'] + ['text'] * 23 + ['jsonb']
+
+def load_packages_copy(cursor, parser, yum_table='pgext.yum', apt_table='pgext.apt'):
     """
-    Parse repository data from pgext.repo_data and populate pgext.apt and pgext.yum tables
+    Stream parsed packages into yum / apt tables with binary COPY, repo by repo
+    A connection runs one COPY at a time, so rpm repos are loaded first, then deb repos
     """
-    print("Starting package data reload...")
-    
-    conn = psycopg.connect(pgurl)
-    cursor = conn.cursor()
-    
-    # Clear existing package data
-    cursor.execute("TRUNCATE TABLE pgext.yum;")
-    cursor.execute("TRUNCATE TABLE pgext.apt;")
-    print("Cleared existing package data")
-    
-    # Get all repositories with binary data from pgext.repo_data
-    cursor.execute("""
-        SELECT rd.id, r.type, rd.data 
-        FROM pgext.repo_data rd
-        JOIN pgext.repository r ON rd.id = r.id
-        WHERE rd.data IS NOT NULL
-        ORDER BY rd.id
-    """)
-    repos = cursor.fetchall()
-    
+    counts = {'rpm': 0, 'deb': 0}
+    for repo_type, table, types in (('rpm', yum_table, YUM_TYPES), ('deb', apt_table, APT_TYPES)):
+        with cursor.copy(f"COPY {table} FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types(types)
+            for repo_id, packages in parser.results(repo_type):
+                for package in packages:
+                    copy.write_row((repo_id, *package))
+                counts[repo_type] += parser.rows[repo_id]
+    return counts['rpm'], counts['deb']
+
+
+def load_packages_executemany(cursor, parser, yum_table='pgext.yum', apt_table='pgext.apt'):
+    """Load parsed packages with executemany over the whole dataset (the original loader)"""
     yum_data = []
     apt_data = []
-    
-    for repo_id, repo_type, binary_data in repos:
-        print(f"Processing {repo_id} ({repo_type})...")
-        
-        try:
-            if repo_type == 'rpm':
-                # Parse YUM repository data (SQLite)
-                packages = parse_yum_data(binary_data)
-                for package in packages:
-                    yum_data.append([repo_id] + list(package))
-                    
-            elif repo_type == 'deb':
-                # Parse APT repository data (Packages file)
-                packages = parse_apt_data(binary_data.decode('utf-8'))
-                for package in packages:
-                    apt_data.append([repo_id] + list(package))
-                    
-        except Exception as e:
-            print(f"Error parsing {repo_id}: {e}")
-    
+    for repo_id, packages in parser.results('rpm'):
+        for package in packages:
+            yum_data.append([repo_id] + list(package))
+    for repo_id, packages in parser.results('deb'):
+        for package in packages:
+            apt_data.append([repo_id] + list(package[:-1]) + [Jsonb(package[-1])])
+
     # Insert YUM data
     if yum_data:
         print(f"Inserting {len(yum_data)} YUM packages...")
-        cursor.executemany("""
-            INSERT INTO pgext.yum VALUES (
+        cursor.executemany(f"""
+            INSERT INTO {yum_table} VALUES (
                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                 %s, %s, %s, %s, %s, %s, %s
             )
         """, yum_data)
-    
-    # Insert APT data  
+
+    # Insert APT data
     if apt_data:
         print(f"Inserting {len(apt_data)} APT packages...")
-        cursor.executemany("""
-            INSERT INTO pgext.apt VALUES (
+        cursor.executemany(f"""
+            INSERT INTO {apt_table} VALUES (
                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
             )
         """, apt_data)
+    return len(yum_data), len(apt_data)
+
+
+LOADERS = {'copy': load_packages_copy, 'executemany': load_packages_executemany}
+
+
+# Reader connection of the current process, each parser process fetches the blobs it parses
+READER = None
+
+
+def init_reader(pgurl):
+    global READER
+    READER = psycopg.connect(pgurl, autocommit=True)
+
+
+def parse_repo(repo_id, repo_type, stream=False):
+    """
+    Fetch and parse the blob of one repo, return (repo_id, rows, seconds, error)
+    In a pool worker rows come back as one compact list of tuples; with stream, rows is
+    the parser's iterator, consumed by the caller while the repo is still being parsed
+    """
+    start = time.perf_counter()
+    try:
+        binary_data = READER.execute("SELECT data FROM pgext.repo_data WHERE id = %s", (repo_id,)).fetchone()[0]
+        if repo_type == 'rpm':
+            # Parse YUM repository data (SQLite)
+            rows = parse_yum_data(binary_data)
+        else:
+            # Parse APT repository data (Packages file)
+            rows = parse_apt_data(binary_data)
+        if not stream:
+            rows = list(rows)
+    except Exception as e:
+        return repo_id, None, time.perf_counter() - start, str(e)
+    return repo_id, rows, time.perf_counter() - start, None
+
+
+class RepoParser:
+    """
+    Parse repos on a process pool, or inline when jobs is 1
+    All repos are submitted up front, largest first, so the pool finishes in about
+    the time of the largest repo; results(repo_type) yields repos of a type as they finish
+    Inline, rows are streamed to the loader as they are parsed, nothing is buffered per repo
+    """
+
+    def __init__(self, pgurl, repos, jobs=1):
+        self.repos = repos
+        self.timings = {}
+        self.rows = {}  # package count of each successfully parsed repo
+        self.executor = None
+        self.futures = {}
+        self.start = time.perf_counter()
+        if jobs > 1:
+            self.executor = ProcessPoolExecutor(jobs, initializer=init_reader, initargs=(pgurl,))
+            for repo_id, repo_type, *_ in repos:
+                future = self.executor.submit(parse_repo, repo_id, repo_type)
+                self.futures.setdefault(repo_type, []).append(future)
+        else:
+            init_reader(pgurl)
+
+    def results(self, repo_type):
+        """
+        Yield (repo_id, rows) for each parsed repo of the given type, skipping unparsable ones
+        rows must be consumed before the next repo is taken, self.rows[repo_id] is set once it is
+        """
+        if self.executor:
+            outcomes = (future.result() for future in as_completed(self.futures.get(repo_type, [])))
+        else:
+            outcomes = (parse_repo(repo_id, type_, stream=True) for repo_id, type_, *_ in self.repos if type_ == repo_type)
+        for repo_id, rows, elapsed, error in outcomes:
+            self.timings[repo_id] = elapsed
+            if error is not None:
+                print(f"Error parsing {repo_id}: {error}")
+                continue
+            if self.executor:
+                print(f"Parsed {repo_id} ({repo_type}): {len(rows)} packages in {elapsed:.2f}s")
+                self.rows[repo_id] = len(rows)
+                yield repo_id, rows
+            else:
+                yield repo_id, self.stream(repo_id, repo_type, rows, elapsed)
+
+    def stream(self, repo_id, repo_type, rows, elapsed):
+        """
+        Pass rows through while counting them, the parse time includes the time the loader takes
+        Rows are already with the loader, so a parse error midway through the data aborts the load
+        instead of skipping the repo
+        """
+        start = time.perf_counter()
+        count = 0
+        for row in rows:
+            count += 1
+            yield row
+        elapsed += time.perf_counter() - start
+        self.timings[repo_id] = elapsed
+        print(f"Parsed {repo_id} ({repo_type}): {count} packages in {elapsed:.2f}s")
+        self.rows[repo_id] = count
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
+        elif READER is not None:
+            READER.close()
+        if self.timings:
+            slowest = max(self.timings, key=self.timings.get)
+            print(f"Parsed {len(self.timings)} repos in {time.perf_counter() - self.start:.2f}s, "
+                  f"slowest {slowest} {self.timings[slowest]:.2f}s, total {sum(self.timings.values()):.2f}s")
+
+
+def fetch_repos(cursor, changed_only=False):
+    """
+    Get repositories with binary data from pgext.repo_data, largest first, as (id, type, size, checksum)
+    The checksum is extra.checksum, or the etag, or a digest of the data when the server sent neither
+    With changed_only, skip repos already parsed with the same checksum, as recorded in pgext.repo_parsed
+    """
+    cursor.execute("""
+        SELECT id, type, size, checksum FROM (
+            SELECT rd.id, r.type, length(rd.data) AS size, rp.repo AS parsed, rp.checksum AS parsed_checksum,
+                   COALESCE(rd.extra ->> 'checksum', rd.etag, 'md5:' || md5(rd.data)) AS checksum
+            FROM pgext.repo_data rd
+            JOIN pgext.repository r ON rd.id = r.id
+            LEFT JOIN pgext.repo_parsed rp ON rd.id = rp.repo
+            WHERE rd.data IS NOT NULL
+        ) d
+        WHERE NOT %(changed_only)s OR parsed IS NULL OR parsed_checksum IS DISTINCT FROM checksum
+        ORDER BY size DESC, id
+    """, {'changed_only': changed_only})
+    return cursor.fetchall()
+
+
+def fetch_removed_repos(cursor):
+    """Get repos recorded in pgext.repo_parsed that are gone from pgext.repo_data, their packages are stale"""
+    cursor.execute("""
+        SELECT rp.repo FROM pgext.repo_parsed rp
+        WHERE NOT EXISTS (SELECT 1 FROM pgext.repo_data rd WHERE rd.id = rp.repo)
+        ORDER BY rp.repo
+    """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def compare_loaders(pgurl=PGURL, jobs=1):
+    """Time every loader against the same repo data, loading into temp tables and rolling back"""
+    with psycopg.connect(pgurl) as conn:
+        cursor = conn.cursor()
+        repos = fetch_repos(cursor)
+        for name, loader in LOADERS.items():
+            cursor.execute("CREATE TEMP TABLE yum_cmp (LIKE pgext.yum INCLUDING ALL) ON COMMIT DROP")
+            cursor.execute("CREATE TEMP TABLE apt_cmp (LIKE pgext.apt INCLUDING ALL) ON COMMIT DROP")
+            start = time.perf_counter()
+            parser = RepoParser(pgurl, repos, jobs)
+            try:
+                yum_count, apt_count = loader(cursor, parser, 'yum_cmp', 'apt_cmp')
+            finally:
+                parser.close()
+            elapsed = time.perf_counter() - start
+            conn.rollback()
+            print(f"{name:<12} {elapsed:8.2f}s  {yum_count} yum rows, {apt_count} apt rows")
+
+
+def reload_pkg(pgurl=PGURL, loader='copy', jobs=1, full=False):
+    """
+    Parse repository data from pgext.repo_data and populate pgext.apt and pgext.yum tables
+    Only repos changed since their last parse are reloaded, and repos removed from repo_data are dropped, unless full is set
+    """
+    print("Starting package data reload...")
     
-    conn.commit()
+    conn = psycopg.connect(pgurl)
+    cursor = conn.cursor()
+    
+    repos = fetch_repos(cursor, changed_only=not full)
+    removed = [] if full else fetch_removed_repos(cursor)
+    if not repos and not removed:
+        print("All repos are up to date, nothing to reload")
+        conn.close()
+        return
+    repo_ids = [repo[0] for repo in repos]
+    
+    # Clear existing package data, all of it or just the changed repos, in the same transaction as the load
+    if full:
+        cursor.execute("TRUNCATE TABLE pgext.yum;")
+        cursor.execute("TRUNCATE TABLE pgext.apt;")
+        cursor.execute("TRUNCATE TABLE pgext.repo_parsed;")
+        print("Cleared existing package data")
+    else:
+        cursor.execute("DELETE FROM pgext.yum WHERE repo = ANY (%s);", (repo_ids + removed,))
+        cursor.execute("DELETE FROM pgext.apt WHERE repo = ANY (%s);", (repo_ids + removed,))
+        print(f"Cleared package data of {len(repo_ids)} changed repos: {', '.join(sorted(repo_ids))}")
+        if removed:
+            cursor.execute("DELETE FROM pgext.repo_parsed WHERE repo = ANY (%s);", (removed,))
+            print(f"Dropped package data of {len(removed)} repos removed from repo_data: {', '.join(removed)}")
     
-    # Call stored procedures to update matrix and package tables
-    print("Reloading matrix and package tables...")
-    cursor.execute("SELECT pgext.reload_matrix();")
-    matrix_count = cursor.fetchone()[0]
+    start = time.perf_counter()
+    parser = RepoParser(pgurl, repos, jobs)
+    try:
+        yum_count, apt_count = LOADERS[loader](cursor, parser)
+    finally:
+        parser.close()
+    print(f"Loaded {yum_count} YUM and {apt_count} APT packages with {loader} in {time.perf_counter() - start:.2f}s")
     
-    cursor.execute("SELECT pgext.reload_package();")
-    package_count = cursor.fetchone()[0]
+    # Record the parsed state, repos that failed to parse are retried next time
+    cursor.executemany("""
+        INSERT INTO pgext.repo_parsed (repo, checksum, rows, parse_at) VALUES (%s, %s, %s, now())
+        ON CONFLICT (repo) DO UPDATE SET checksum = EXCLUDED.checksum, rows = EXCLUDED.rows, parse_at = EXCLUDED.parse_at
+    """, [(repo_id, checksum, parser.rows[repo_id]) for repo_id, _, _, checksum in repos if repo_id in parser.rows])
+    
+    conn.commit()
+    
+    if full:
+        # Call stored procedures to update matrix and package tables
+        print("Reloading matrix and package tables...")
+        cursor.execute("SELECT pgext.reload_matrix();")
+        matrix_count = cursor.fetchone()[0]
+        
+        cursor.execute("SELECT pgext.reload_package();")
+        package_count = cursor.fetchone()[0]
+        oses = None
+    else:
+        # Only the packages of changed and removed repos, and the os slices they belong to, are recomputed
+        print("Reloading package table of changed repos...")
+        matrix_count = 0
+        cursor.execute("""
+            SELECT array_agg(DISTINCT os) FROM (
+                SELECT os FROM pgext.repository WHERE id = ANY (%(repos)s) UNION
+                SELECT os FROM pgext.package WHERE repo = ANY (%(removed)s)
+            ) r
+        """, {'repos': repo_ids, 'removed': removed})  # removed repos may be gone from pgext.repository too
+        oses = cursor.fetchone()[0]
+        cursor.execute("SELECT pgext.reload_package(%s);", (repo_ids + removed,))
+        package_count = cursor.fetchone()[0]
     
     conn.commit()
     
     # Update matrix table with new columns: count, pkg_repo, pkg_ver
-    print("Updating matrix table with package statistics...")
-    cursor.execute("SELECT pgext.update_matrix();")
+    print(f"Updating matrix table with package statistics ({'all' if oses is None else ', '.join(oses)})...")
+    cursor.execute("SELECT pgext.update_matrix(%s);", (oses,))
     matrix_stats_count = cursor.fetchone()[0]
     
     conn.commit()
@@ -103,98 +312,129 @@ def reload_pkg(pgurl=PGURL):
 
 
 
+# primary.sqlite packages columns, in pgext.yum column order
+YUM_COLUMNS = [
+    'pkgKey', 'pkgId', 'name', 'arch', 'version', 'epoch', 'release', 'summary', 'description', 'url',
+    'time_file', 'time_build', 'rpm_license', 'rpm_vendor', 'rpm_group', 'rpm_buildhost', 'rpm_sourcerpm',
+    'rpm_header_start', 'rpm_header_end', 'rpm_packager', 'size_package', 'size_installed', 'size_archive',
+    'location_href', 'location_base', 'checksum_type',
+]
+
+
 def parse_yum_data(binary_data):
-    """Parse YUM SQLite data from binary data"""
-    # Create an in-memory SQLite database
-    temp_db = io.BytesIO(binary_data)
-    
-    # Save to temporary file since sqlite3 doesn't support BytesIO directly
-    import tempfile
-    with tempfile.NamedTemporaryFile() as temp_file:
-        temp_file.write(binary_data)
-        temp_file.flush()
-        
-        conn = sqlite3.connect(temp_file.name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM packages")
-        rows = cursor.fetchall()
+    """
+    Parse YUM SQLite data from binary data, return an iterator of package rows
+    The image is deserialized into an in-memory database, no temp file involved.
+    The query runs eagerly so a broken image fails here, rows are then streamed from the cursor
+    """
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.deserialize(binary_data)
+        cursor = conn.execute(f"SELECT {', '.join(YUM_COLUMNS)} FROM packages")
+    except Exception:
         conn.close()
-        
-    return rows
+        raise
 
+    def rows():
+        try:
+            yield from cursor
+        finally:
+            conn.close()
 
-def parse_apt_data(packages_content):
-    """Parse APT Packages file content"""
-    fixed_fields = [
-        'Package', 'Version', 'Architecture', 'Size', 'Installed-Size', 'Priority', 'Section', 'Filename', 
-        'SHA256', 'SHA1', 'MD5sum', 'Maintainer', 'Homepage', 'Depends', 'Source', 'Provides', 
-        'Recommends', 'Suggests', 'Conflicts', 'Breaks', 'Replaces', "Enhances", "Pre-Depends", 
-        'Build-Ids', 'Package-Type', 'Auto-Built-Package', 'Multi-Arch', 'Description'
-    ]
-    
-    def parse_package_record(record):
-        package_info = {}
-        current_key = None
-        
-        for line in record.split('\n'):
-            if not line.strip():
+    return rows()
+
+
+# Packages fields with a dedicated pgext.apt column, in column order, others go to extra
+APT_FIELDS = [
+    'Package', 'Version', 'Architecture', 'Size', 'Installed-Size', 'Priority', 'Section', 'Filename',
+    'SHA256', 'SHA1', 'MD5sum', 'Maintainer', 'Homepage', 'Depends', 'Source', 'Provides',
+    'Recommends', 'Suggests', 'Conflicts', 'Breaks', 'Replaces', "Enhances", "Pre-Depends",
+    'Build-Ids', 'Package-Type', 'Auto-Built-Package', 'Multi-Arch', 'Description'
+]
+APT_FIELD_INDEX = {field.encode(): i for i, field in enumerate(APT_FIELDS)}
+APT_SIZE = APT_FIELDS.index('Size')
+APT_INSTALLED_SIZE = APT_FIELDS.index('Installed-Size')
+APT_DESCRIPTION = APT_FIELDS.index('Description')
+APT_DEFAULTS = [''] * len(APT_FIELDS)
+APT_DEFAULTS[APT_SIZE] = None
+APT_DEFAULTS[APT_INSTALLED_SIZE] = 0
+
+
+def parse_apt_data(packages_data):
+    """
+    Parse APT Packages file content (bytes), return an iterator of package rows
+    Single pass over the raw bytes: stanzas are located with find, keys split with partition,
+    fixed fields go to tuple slots by index, leftover fields are collected into the extra dict
+    """
+    fields, defaults = APT_FIELD_INDEX, APT_DEFAULTS
+    size_index, installed_index, description_index = APT_SIZE, APT_INSTALLED_SIZE, APT_DESCRIPTION
+    find = packages_data.find
+    pos, end = 0, len(packages_data)
+    while pos < end:
+        stop = find(b'\n\n', pos)
+        if stop < 0:
+            stop = end
+        record = packages_data[pos:stop]
+        pos = stop + 2
+        if not record or record.isspace():
+            continue
+
+        values = defaults.copy()
+        extra = {}
+        description = None
+        in_description = False
+        for line in record.split(b'\n'):
+            if not line:
                 continue
-            if line[0] != ' ':
-                match = re.match(r'^(.*?):\s*(.*)', line.strip())
-                if match:
-                    key, value = match.groups()
-                    key = key.strip()
-                    value = value.strip()
-                    current_key = key
-                    
-                    if key == 'Installed-Size':
-                        if not value or value == '':
-                            value = 0
-                        else:
-                            try:
-                                value = int(value) * 1024  # Convert KB to bytes
-                            except ValueError:
-                                value = 0
-                    elif key in ['Size']:
-                        try:
-                            value = int(value)
-                        except ValueError:
-                            value = 0
-                    
-                    if key == 'Description':
-                        package_info[key] = [value]
-                    else:
-                        package_info[key] = value
-            elif current_key == 'Description':
-                package_info[current_key].append(line.strip())
-        
-        if 'Description' in package_info:
-            description = "\n".join(package_info['Description'])
-            package_info['Description'] = description
-        
-        fixed_values = tuple(package_info.get(field, '') for field in fixed_fields)
-        other_fields = {key: value for key, value in package_info.items()
-                       if key not in fixed_fields}
-        other_fields_json = json.dumps(other_fields)
-        return fixed_values + (other_fields_json,)
-    
-    records = packages_content.split('\n\n')
-    parsed_packages = []
-    
-    for record in records:
-        if record.strip():
-            package = parse_package_record(record)
-            # Fix empty size values
-            package = list(package)
-            if package[4] == '':  # Installed-Size
-                package[4] = 0
-            parsed_packages.append(tuple(package))
-    
-    return parsed_packages
+            if line[0] == 32:  # continuation line, only kept for Description
+                if in_description:
+                    line = line.strip()
+                    if line:
+                        description.append(line.decode())
+                continue
+            key, sep, value = line.partition(b':')
+            if not sep:
+                continue
+            index = fields.get(key)
+            if index is None:
+                key = key.strip()
+                index = fields.get(key)
+            in_description = index == description_index
+            if index is None:
+                extra[key.decode()] = value.strip().decode()
+            elif in_description:
+                description = [value.strip().decode()]
+            elif index == size_index:
+                try:
+                    values[index] = int(value)
+                except ValueError:
+                    values[index] = 0
+            elif index == installed_index:
+                try:
+                    values[index] = int(value) * 1024  # Convert KB to bytes
+                except ValueError:
+                    values[index] = 0
+            else:
+                values[index] = value.strip().decode()
+
+        if description is not None:
+            values[description_index] = "\n".join(description)
+        values.append(extra)
+        yield tuple(values)
 
 
 def main():
-    reload_pkg()
+    parser = argparse.ArgumentParser(description="Reload pgext.yum / pgext.apt from pgext.repo_data")
+    parser.add_argument('--pgurl', default=PGURL, help="postgres connection string")
+    parser.add_argument('--loader', choices=sorted(LOADERS), default='copy', help="bulk load method")
+    parser.add_argument('--compare', action='store_true', help="time all loaders into temp tables, then exit")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="parser processes, 1 parses inline")
+    parser.add_argument('--full', action='store_true', help="truncate and reparse every repo, not just the changed ones")
+    args = parser.parse_args()
+    if args.compare:
+        compare_loaders(args.pgurl, args.jobs)
+    else:
+        reload_pkg(args.pgurl, args.loader, args.jobs, args.full)
 
 
 if __name__ == "__main__":
@@ -1,171 +1,489 @@
 #!/usr/bin/env python3
 
-import requests
-import psycopg
-import sqlite3
+import asyncio
+import argparse
+import importlib.util
+import csv
 import json
-import re
 import bz2
+import lzma
+import zlib
 import hashlib
+import struct
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
 from xml.etree import ElementTree as ET
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-import io
+
+import httpx
+import psycopg
+
+try:
+    import zstandard  # optional, for .zst primary_db on newer EL mirrors
+except ImportError:
+    zstandard = None
 
 PGURL = "postgres:///vonng"
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+CHUNK_SIZE = 256 * 1024         # network read size
+SPOOL_SIZE = 8 * 1024 * 1024    # decompressed data beyond this goes to a temp file
+BATCH_SIZE = 8                  # max repos per COPY batch / commit
+
+# Max in-flight requests per upstream host, other hosts use DEFAULT_HOST_LIMIT
+HOST_LIMITS = {
+    'download.postgresql.org': 8,
+    'apt.postgresql.org': 8,
+    'repo.pigsty.io': 8,
+    'repo.pigsty.cc': 8,
+}
+DEFAULT_HOST_LIMIT = 4
 
-def reload_repo(pgurl=PGURL, max_workers=4):
+# HTTP/2 requires the optional h2 package, otherwise use pooled HTTP/1.1 keep-alive
+HTTP2 = importlib.util.find_spec('h2') is not None
+
+
+class RepoFetcher:
     """
-    Download repository metadata and store binary data to pgext.repo_data
-    Uses HTTP caching headers (etag, size, last-modified) to avoid redundant downloads
+    Asyncio HTTP engine shared by all repositories
+    One pooled keep-alive client (HTTP/2 multiplexed when available), with a
+    semaphore per upstream host to cap concurrent requests against each mirror
     """
-    print("Starting repository reload...")
 
-    conn = psycopg.connect(pgurl)
-    cursor = conn.cursor()
+    def __init__(self, host_limits=None, default_limit=DEFAULT_HOST_LIMIT, mirror=None, timeout=120):
+        self.host_limits = {**HOST_LIMITS, **(host_limits or {})}
+        self.default_limit = default_limit
+        self.mirror = mirror.rstrip('/') if mirror else None
+        self.semaphores = {}
+        self.client = httpx.AsyncClient(
+            http2=HTTP2,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=64),
+        )
+
+    def _route(self, url):
+        """Return the effective url and the semaphore of its upstream host"""
+        parts = urlsplit(url)
+        host = parts.hostname
+        if self.mirror:
+            # fake-mirror.py serves every upstream under /{host}/{path}
+            url = f"{self.mirror}/{parts.netloc}{parts.path}"
+        semaphore = self.semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.host_limits.get(host, self.default_limit))
+            self.semaphores[host] = semaphore
+        return url, semaphore
+
+    async def get(self, url, headers=None):
+        url, semaphore = self._route(url)
+        async with semaphore:
+            return await self.client.get(url, headers=headers)
+
+    @asynccontextmanager
+    async def stream(self, url, headers=None):
+        """GET with a streamed body, the host slot is held until the body is consumed"""
+        url, semaphore = self._route(url)
+        async with semaphore:
+            async with self.client.stream('GET', url, headers=headers) as response:
+                yield response
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def make_decompressor(location):
+    """Pick a streaming decompressor from the file suffix, None for uncompressed files"""
+    if location.endswith('.bz2'):
+        return bz2.BZ2Decompressor()
+    if location.endswith('.xz'):
+        return lzma.LZMADecompressor()
+    if location.endswith('.gz'):
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    if location.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard module is required to decompress {location}")
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+
+class StreamDecoder:
+    """
+    Decompress a download chunk by chunk as it arrives
+    Output is hashed with SHA-256 incrementally and spooled to a temp file,
+    so memory stays bounded regardless of repo size
+    """
 
-    # Get all repositories with their metadata URLs and existing cache data
-    cursor.execute("""
-                   SELECT r.id, r.default_meta, r.type, rd.etag, rd.size, rd.last_modified, rd.extra
-                   FROM pgext.repository r
-                            LEFT JOIN pgext.repo_data rd ON r.id = rd.id
-                   WHERE r.default_meta IS NOT NULL
-                   ORDER BY r.id
-                   """)
-    repos = cursor.fetchall()
+    def __init__(self, location):
+        self.decompressor = make_decompressor(location)
+        self.sha256 = hashlib.sha256()
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self.size = 0
+        self.elapsed = 0.0  # time spent decompressing / hashing / spooling
 
-    def download_repo_data(repo_info):
-        repo_id, metadata_url, repo_type, existing_etag, existing_size, existing_last_modified, existing_extra = repo_info
-        existing_extra = existing_extra or {}
+    def feed(self, chunk):
+        start = time.perf_counter()
+        data = self.decompressor.decompress(chunk) if self.decompressor else chunk
+        if data:
+            self.sha256.update(data)
+            self.file.write(data)
+            self.size += len(data)
+        self.elapsed += time.perf_counter() - start
 
-        print(f"Processing {repo_id} ({repo_type})...")
+    def hexdigest(self):
+        return self.sha256.hexdigest()
 
-        try:
-            # Prepare headers for conditional requests
-            headers = {}
-            if existing_etag:
-                headers['If-None-Match'] = existing_etag
-            if existing_last_modified:
-                headers['If-Modified-Since'] = existing_last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    def chunks(self, size=CHUNK_SIZE):
+        """Iterate over the decompressed data without loading it all in memory"""
+        self.file.seek(0)
+        while chunk := self.file.read(size):
+            yield chunk
 
-            # Make conditional request first
-            response = requests.head(metadata_url, headers=headers, timeout=30)
+    def close(self):
+        self.file.close()
 
-            # Check if content has been modified
+
+async def fetch_decoded(fetcher, url, location, headers=None):
+    """
+    Stream url through a StreamDecoder, return (decoder, response)
+    decoder is None if the server answers 304 Not Modified to a conditional request
+    Decompression runs in a worker thread so it overlaps with network I/O of other repos
+    """
+    decoder = StreamDecoder(location)
+    try:
+        async with fetcher.stream(url, headers=headers) as response:
             if response.status_code == 304:
+                decoder.close()
+                return None, response
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                await asyncio.to_thread(decoder.feed, chunk)
+    except BaseException:
+        decoder.close()
+        raise
+    return decoder, response
+
+
+async def fetch_release_checksum(fetcher, packages_url):
+    """
+    Find the SHA256 of a Packages file in the InRelease / Release file of its suite
+    e.g. .../dists/bookworm-pgdg/main/binary-amd64/Packages -> .../dists/bookworm-pgdg/InRelease
+    Return the hex digest, or None if the suite has no usable Release file
+    """
+    prefix, sep, rest = packages_url.partition('/dists/')
+    suite, _, entry = rest.partition('/')
+    if not sep or not entry:
+        return None
+    for name in ('InRelease', 'Release'):
+        response = await fetcher.get(f"{prefix}/dists/{suite}/{name}")
+        if response.status_code != 200:
+            continue
+        # SHA256 section lines look like: " <sha256> <size> main/binary-amd64/Packages"
+        in_sha256 = False
+        for line in response.text.splitlines():
+            if not line.startswith(' '):
+                in_sha256 = line.startswith('SHA256:')
+                continue
+            if in_sha256:
+                fields = line.split()
+                if len(fields) == 3 and fields[2] == entry:
+                    return fields[0]
+    return None
+
+
+def parse_http_date(value):
+    """Parse Last-Modified header into datetime, None if absent or malformed"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%a, %d %b %Y %H:%M:%S GMT')
+    except ValueError:
+        return None
+
+
+def load_repos_from_csv(csv_path=DATA_DIR / "repository.csv"):
+    """Load repository list from data/repository.csv, without any cache info (dry-run)"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return [(row['id'], row['default_meta'], row['type'], None, None, None, None)
+                for row in csv.DictReader(f) if row['default_meta']]
+
+
+async def download_repo_data(fetcher, repo_info):
+    """
+    Fetch the metadata of one repository, return the row to be stored in pgext.repo_data
+    or None if the repo is unchanged or failed
+    """
+    repo_id, metadata_url, repo_type, existing_etag, existing_size, existing_last_modified, existing_extra = repo_info
+    existing_extra = existing_extra or {}
+
+    print(f"Processing {repo_id} ({repo_type})...")
+
+    try:
+        if repo_type == 'deb':
+            # APT repository - the suite Release file lists the SHA256 of every Packages file
+            checksum = await fetch_release_checksum(fetcher, metadata_url)
+            if checksum and checksum == existing_extra.get('checksum'):
+                print(f"{repo_id}: Packages checksum unchanged, skipping download")
+                return None
+
+            # No Release file: fall back to a conditional GET on Packages itself
+            headers = {}
+            if not checksum:
+                if existing_etag:
+                    headers['If-None-Match'] = existing_etag
+                if existing_last_modified:
+                    headers['If-Modified-Since'] = existing_last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+            # Stream the Packages file directly
+            decoder, response = await fetch_decoded(fetcher, metadata_url, metadata_url, headers)
+            if decoder is None:
                 print(f"{repo_id}: Not modified (304), skipping download")
-                return
-            elif response.status_code != 200:
-                print(f"{repo_id}: Error {response.status_code}")
-                return
+                return None
+            if checksum and decoder.hexdigest() != checksum:
+                print(f"{repo_id}: Checksum mismatch, skipping")
+                decoder.close()
+                return None
+            extra = {**existing_extra, 'checksum': checksum}
+
+        elif repo_type == 'rpm':
+            # YUM repository - repomd.xml is a few KB, always fetch it
+            response = await fetcher.get(metadata_url)
+            response.raise_for_status()
+
+            # Parse repomd.xml to find primary.sqlite.{bz2,xz,zst}
+            root = ET.fromstring(response.content)
+            namespace = {'repo': 'http://linux.duke.edu/metadata/repo'}
+            primary_data = root.find(".//repo:data[@type='primary_db']", namespace)
+
+            if primary_data is None:
+                print(f"{repo_id}: No primary_db found in repomd.xml")
+                return None
+
+            revision = root.findtext('repo:revision', namespaces=namespace)
+            primary_location = primary_data.find('repo:location', namespace).attrib['href']
+            primary_checksum = primary_data.findtext('repo:checksum', namespaces=namespace)
+            primary_open_checksum = primary_data.find('repo:open-checksum[@type="sha256"]', namespace).text
+
+            # Skip the multi-MB primary_db if it is the same one we already have
+            if primary_checksum and primary_checksum == existing_extra.get('checksum'):
+                print(f"{repo_id}: primary_db checksum unchanged (revision {revision}), skipping download")
+                return None
+
+            # Construct URL for primary_db
+            base_url = metadata_url.rsplit('/', 2)[0]  # Remove repodata/repomd.xml
+            primary_url = f"{base_url}/{primary_location}"
+
+            # Download and decompress primary_db, codec is chosen by the location suffix
+            decoder, response = await fetch_decoded(fetcher, primary_url, primary_location)
+
+            # Verify checksum of the decompressed image
+            if decoder.hexdigest() != primary_open_checksum:
+                print(f"{repo_id}: Checksum mismatch, skipping")
+                decoder.close()
+                return None
+            extra = {**existing_extra, 'revision': revision, 'checksum': primary_checksum,
+                     'open_checksum': primary_open_checksum, 'location': primary_location}
+        else:
+            print(f"{repo_id}: Unknown repository type {repo_type}")
+            return None
+
+        # Extract cache information from response headers
+        etag = response.headers.get('ETag')
+        last_modified = parse_http_date(response.headers.get('Last-Modified'))
+        size = decoder.size
+        print(f"{repo_id}: Downloaded {size} bytes")
+        return repo_id, etag, size, extra, decoder, last_modified
+
+    except Exception as e:
+        print(f"{repo_id}: Error downloading - {e}")
+        return None
+
+
+# PostgreSQL binary COPY framing, see https://www.postgresql.org/docs/current/sql-copy.html
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+COPY_TRAILER = struct.pack('!h', -1)
+
+
+def copy_text(value):
+    """Encode a nullable text field for binary COPY"""
+    if value is None:
+        return struct.pack('!i', -1)
+    data = value.encode()
+    return struct.pack('!i', len(data)) + data
+
+
+class RepoWriter:
+    """
+    Single writer task with its own connection, fed by a queue of downloaded repos
+    Each batch is streamed into a temp staging table with binary COPY (the spooled data
+    is sent chunk by chunk), then upserted into pgext.repo_data with one commit per batch
+    """
 
-            # Check content-length for additional validation
-            remote_size = response.headers.get('Content-Length')
-            remote_etag = response.headers.get('ETag')
+    def __init__(self, pgurl, timings, batch_size=BATCH_SIZE):
+        self.pgurl = pgurl
+        self.timings = timings
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue()
+        self.conn = None
 
-            if (existing_size and remote_size and int(remote_size) == existing_size and
-                    existing_etag and remote_etag and existing_etag == remote_etag):
-                print(f"{repo_id}: Same size and etag, skipping download")
+    async def run(self):
+        """Consume the queue until a None sentinel arrives"""
+        self.conn = await psycopg.AsyncConnection.connect(self.pgurl)
+        try:
+            await self.conn.execute("""
+                CREATE TEMP TABLE repo_data_stage (
+                    id TEXT, etag TEXT, size BIGINT, extra TEXT, last_modified TEXT, data BYTEA
+                ) ON COMMIT DELETE ROWS
+            """)
+            await self.conn.commit()
+            done = False
+            while not done:
+                # Block for the first row, then take whatever else is already waiting
+                batch = [await self.queue.get()]
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if batch:
+                    await self.write_batch(batch)
+        finally:
+            await self.conn.close()
+
+    async def write_batch(self, batch):
+        start = time.perf_counter()
+        repo_ids = [row[0] for row in batch]
+        try:
+            async with self.conn.cursor() as cursor:
+                async with cursor.copy("COPY repo_data_stage FROM STDIN (FORMAT BINARY)") as copy:
+                    await copy.write(COPY_SIGNATURE)
+                    for repo_id, etag, size, extra, decoder, last_modified in batch:
+                        await copy.write(
+                            struct.pack('!h', 6) + copy_text(repo_id) + copy_text(etag) +
+                            struct.pack('!iq', 8, size) + copy_text(json.dumps(extra)) +
+                            copy_text(last_modified.isoformat() if last_modified else None) +
+                            struct.pack('!i', size))
+                        for chunk in decoder.chunks():
+                            await copy.write(chunk)
+                    await copy.write(COPY_TRAILER)
+                await cursor.execute("""
+                                     INSERT INTO pgext.repo_data (id, etag, size, extra, data, last_modified, update_at)
+                                     SELECT id, etag, size, extra::JSONB, data, last_modified::TIMESTAMPTZ, CURRENT_TIMESTAMP
+                                     FROM repo_data_stage
+                                     ON CONFLICT (id) DO UPDATE SET
+                                                                    etag = EXCLUDED.etag,
+                                                                    size = EXCLUDED.size,
+                                                                    extra = EXCLUDED.extra,
+                                                                    data = EXCLUDED.data,
+                                                                    last_modified = EXCLUDED.last_modified,
+                                                                    update_at = CURRENT_TIMESTAMP
+                                     """)
+            await self.conn.commit()
+            print(f"Stored {len(batch)} repos: {', '.join(repo_ids)}")
+        except Exception as e:
+            await self.conn.rollback()
+            print(f"Error storing {', '.join(repo_ids)} - {e}")
+        finally:
+            for row in batch:
+                row[4].close()
+        elapsed = time.perf_counter() - start
+        for repo_id in repo_ids:
+            self.timings[repo_id]['write'] = elapsed
+
+
+def print_timings(timings):
+    """Print per-repo download / decompress / write seconds, write time is per batch"""
+    print(f"{'repo':<28}{'download':>10}{'decompress':>12}{'write':>10}{'size':>14}")
+    for repo_id, t in sorted(timings.items()):
+        cells = [f"{t[k]:.2f}" if k in t else '-' for k in ('download', 'decompress', 'write')]
+        size = t.get('size', '-')
+        print(f"{repo_id:<28}{cells[0]:>10}{cells[1]:>12}{cells[2]:>10}{size:>14}")
+
+
+async def _reload_repo(pgurl, host_limits, default_limit, mirror, dry_run):
+    fetcher = RepoFetcher(host_limits, default_limit, mirror)
+    timings = {}
+    writer = writer_task = None
+    try:
+        if dry_run:
+            repos = load_repos_from_csv()
+        else:
+            async with await psycopg.AsyncConnection.connect(pgurl) as conn:
+                # Get all repositories with their metadata URLs and existing cache data
+                async with conn.cursor() as cursor:
+                    await cursor.execute("""
+                                         SELECT r.id, r.default_meta, r.type, rd.etag, rd.size, rd.last_modified, rd.extra
+                                         FROM pgext.repository r
+                                                  LEFT JOIN pgext.repo_data rd ON r.id = rd.id
+                                         WHERE r.default_meta IS NOT NULL
+                                         ORDER BY r.id
+                                         """)
+                    repos = await cursor.fetchall()
+            writer = RepoWriter(pgurl, timings)
+            writer_task = asyncio.create_task(writer.run())
+
+        async def process(repo_info):
+            start = time.perf_counter()
+            row = await download_repo_data(fetcher, repo_info)
+            timings[repo_info[0]] = {'download': time.perf_counter() - start}
+            if row is None:
                 return
-
-            # Download the actual data
-            if repo_type == 'deb':
-                # APT repository - download Packages file directly
-                response = requests.get(metadata_url, timeout=60)
-                response.raise_for_status()
-                binary_data = response.content
-
-            elif repo_type == 'rpm':
-                # YUM repository - download and parse repomd.xml, then get primary.sqlite.bz2
-                response = requests.get(metadata_url, timeout=60)
-                response.raise_for_status()
-
-                # Parse repomd.xml to find primary.sqlite.bz2
-                root = ET.fromstring(response.content)
-                namespace = {'repo': 'http://linux.duke.edu/metadata/repo'}
-                primary_data = root.find(".//repo:data[@type='primary_db']", namespace)
-
-                if primary_data is None:
-                    print(f"{repo_id}: No primary_db found in repomd.xml")
-                    return
-
-                primary_location = primary_data.find('repo:location', namespace).attrib['href']
-                primary_checksum = primary_data.find('repo:open-checksum[@type="sha256"]', namespace).text
-
-                # Construct URL for primary.sqlite.bz2
-                base_url = metadata_url.rsplit('/', 2)[0]  # Remove repodata/repomd.xml
-                primary_url = f"{base_url}/{primary_location}"
-
-                # Download and decompress primary.sqlite.bz2
-                response = requests.get(primary_url, stream=True, timeout=120)
-                response.raise_for_status()
-
-                # Decompress bz2 data in memory
-                compressed_data = response.content
-                binary_data = bz2.decompress(compressed_data)
-
-                # Verify checksum
-                actual_checksum = hashlib.sha256(binary_data).hexdigest()
-                if actual_checksum != primary_checksum:
-                    print(f"{repo_id}: Checksum mismatch, skipping")
-                    return
+            timings[row[0]].update(decompress=row[4].elapsed, size=row[2])
+            if writer is not None:
+                await writer.queue.put(row)  # writes never block the downloads
             else:
-                print(f"{repo_id}: Unknown repository type {repo_type}")
-                return
+                row[4].close()
 
-            # Extract cache information from response headers
-            etag = response.headers.get('ETag')
-            last_modified_str = response.headers.get('Last-Modified')
-            content_length = response.headers.get('Content-Length')
-
-            # Parse last_modified timestamp
-            last_modified = None
-            if last_modified_str:
-                from datetime import datetime
-                try:
-                    last_modified = datetime.strptime(last_modified_str, '%a, %d %b %Y %H:%M:%S GMT')
-                except ValueError:
-                    pass
-
-            size = len(binary_data)
-
-            # Store or update binary data and cache info in pgext.repo_data
-            update_cursor = conn.cursor()
-            update_cursor.execute("""
-                                  INSERT INTO pgext.repo_data (id, etag, size, extra, data, last_modified, update_at)
-                                  VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-                                  ON CONFLICT (id) DO UPDATE SET
-                                                                 etag = EXCLUDED.etag,
-                                                                 size = EXCLUDED.size,
-                                                                 extra = EXCLUDED.extra,
-                                                                 data = EXCLUDED.data,
-                                                                 last_modified = EXCLUDED.last_modified,
-                                                                 update_at = CURRENT_TIMESTAMP
-                                  """, (repo_id, etag, size, json.dumps(existing_extra), binary_data, last_modified))
-            conn.commit()
-
-            print(f"{repo_id}: Downloaded {size} bytes")
+        # All repos are in flight at once, throttled only by the per-host limits
+        await asyncio.gather(*(process(repo) for repo in repos))
+    finally:
+        await fetcher.aclose()
+        if writer is not None:
+            await writer.queue.put(None)
+            await writer_task
+    print_timings(timings)
 
-        except Exception as e:
-            print(f"{repo_id}: Error downloading - {e}")
 
-    # Use ThreadPoolExecutor for parallel downloads
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(download_repo_data, repo) for repo in repos]
-        for future in futures:
-            future.result()
+def reload_repo(pgurl=PGURL, host_limits=None, default_limit=DEFAULT_HOST_LIMIT, mirror=None, dry_run=False):
+    """
+    Download repository metadata and store binary data to pgext.repo_data
+    Skips unchanged repos by the checksum recorded in extra: repomd.xml primary_db checksum
+    for rpm, Release SHA256 of Packages for deb (falling back to etag / last-modified)
+    """
+    print("Starting repository reload...")
+    start = time.monotonic()
+    asyncio.run(_reload_repo(pgurl, host_limits, default_limit, mirror, dry_run))
+    print(f"Repository reload completed in {time.monotonic() - start:.2f}s")
+
 
-    conn.close()
-    print("Repository reload completed")
+def parse_host_limit(value):
+    """Parse HOST=N command line option"""
+    host, _, limit = value.partition('=')
+    if not host or not limit.isdigit() or int(limit) < 1:
+        raise argparse.ArgumentTypeError(f"expect HOST=N, got {value!r}")
+    return host, int(limit)
 
 
 def main():
     """Main function to run both reload operations"""
+    parser = argparse.ArgumentParser(description="Reload repository metadata into pgext.repo_data")
+    parser.add_argument('--pgurl', default=PGURL, help="postgres connection string")
+    parser.add_argument('--limit', action='append', type=parse_host_limit, default=[], metavar='HOST=N',
+                        help="max concurrent requests to HOST (repeatable)")
+    parser.add_argument('--default-limit', type=int, default=DEFAULT_HOST_LIMIT,
+                        help="max concurrent requests to hosts not listed in HOST_LIMITS")
+    parser.add_argument('--mirror', help="fetch every url from this base instead, e.g. http://127.0.0.1:8765 (see fake-mirror.py)")
+    parser.add_argument('--dry-run', action='store_true', help="read repos from data/repository.csv and skip database writes")
+    args = parser.parse_args()
+
     print("=== PostgreSQL Extension Repository Reload ===")
 
     # Step 1: Download repository metadata
-    reload_repo()
+    reload_repo(args.pgurl, dict(args.limit), args.default_limit, args.mirror, args.dry_run)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
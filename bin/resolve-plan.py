@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+
+"""
+Resolve extension install plans into concrete RPM / DEB packages.
+Reads JSON lines specs and writes one JSON lines plan per spec, from extension.csv and data/ext/*.json.
+
+    echo '{"id": "c1", "os": "el9.x86_64", "pg": 17, "extensions": ["vectorize", "postgis"]}' | python bin/resolve-plan.py
+    python bin/resolve-plan.py specs.jsonl > plans.jsonl
+    python bin/resolve-plan.py --os u24.aarch64 --pg 17 -e pg_duckdb -e vector
+
+Each plan lists the requested extensions plus everything they require in install order, the latest
+package of each extension package for that os / pg (url, sha256, size), contrib extensions that
+need no package, external system dependencies, and anything missing or unknown.
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import argparse
+import contextlib
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common_utils import Config, Dataset
+
+VERSION_TOKEN = re.compile(r'~|\d+|[A-Za-z]+')
+VERSION_RELEASE = re.compile(r'^(.*)-([^-]+)$')
+
+
+def version_key(version: Optional[str], release: Optional[str] = None) -> str:
+    """Debian / RPM aware version ordering key, same encoding as pgext.version_key() in schema.sql."""
+    epoch = '0'
+    m = re.match(r'^(\d+):(.*)$', version or '')
+    if m:
+        epoch, version = m.group(1), m.group(2)
+    epoch = epoch.lstrip('0') or '0'
+    key = ['D', chr(64 + len(epoch)), epoch]
+    for part in (version or '', release or ''):
+        for tok in VERSION_TOKEN.findall(part):
+            if tok == '~':
+                key.append('A')
+            elif tok[0].isdigit():
+                tok = tok.lstrip('0') or '0'
+                key.extend(('D', chr(64 + len(tok)), tok))
+            else:
+                key.extend(('C', tok, '.'))
+        key.append('B')
+    return ''.join(key)
+
+
+def normalize_version(version: str) -> Tuple[int, int, int]:
+    """major.minor.patch of a version, same as pgext.normalize_version() in schema.sql."""
+    parts = re.sub(r'^1:', '', version).split('.')
+    numbers = []
+    for part in (parts + ['0', '0'])[:3]:
+        m = re.match(r'\d+', part)
+        numbers.append(int(m.group()) if m else 0)
+    return tuple(numbers)
+
+
+def package_order(ver: str) -> Tuple[Tuple[int, int, int], str]:
+    """Sort key of a package ver (version-release), as pgext.availability orders: semver, then vkey."""
+    m = VERSION_RELEASE.match(ver or '')
+    version, release = (m.group(1), m.group(2)) if m else (ver or '', None)
+    return normalize_version(version), version_key(version, release)
+
+
+class PlanResolver:
+    """Install plan resolver over prebuilt in-memory indexes, shared sub-results are memoized per instance."""
+
+    def __init__(self, dataset: Dataset = None):
+        self.dataset = dataset or Dataset(Config())
+        with contextlib.redirect_stdout(sys.stderr):  # keep stdout for plans
+            self.extensions = {ext.name: ext for ext in self.dataset.extensions}
+            self.graph = self.dataset.dependencies
+            ext_data = self.dataset.ext_data
+
+        self.matrix = {}  # (pkg, os, pg) -> matrix entry
+        self.packages = {}  # (pkg, os, pg, name) -> package entries
+        seen = set()
+        for data in ext_data.values():
+            pkg = data.get('pkg')
+            if not pkg or pkg in seen:  # sibling extensions share the package documents
+                continue
+            seen.add(pkg)
+            for entry in data.get('matrix') or ():
+                self.matrix.setdefault((pkg, entry['os'], entry['pg']), entry)
+            for entry in data.get('package') or ():
+                self.packages.setdefault((pkg, entry['os'], entry['pg'], entry['name']), []).append(entry)
+        self.platforms = {entry['os']: entry['type'] for entry in self.matrix.values()}  # os -> rpm / deb
+
+        self.repos = {}  # os -> [(base url, org)], longest base url first
+        with open(os.path.join(self.dataset.config.DATA_DIR, 'repository.csv'), 'r', encoding='utf-8') as f:
+            for repo in csv.DictReader(f):
+                self.repos.setdefault(repo['os'], []).append((repo['default_url'].rstrip('/') + '/', repo['org']))
+        for repos in self.repos.values():
+            repos.sort(key=lambda repo: len(repo[0]), reverse=True)
+
+        self.package_memo = {}  # (pkg, os, pg) -> resolved package
+        self.plan_memo = {}  # (names, os, pg) -> resolved plan parts
+
+    def package_repo(self, package: Dict[str, Any]) -> Optional[str]:
+        """Repo (org) a package entry was fetched from, by the base url of its download url."""
+        for base_url, org in self.repos.get(package['os'], ()):
+            if package['url'].startswith(base_url):
+                return org
+        return None
+
+    def resolve_package(self, pkg: str, os_name: str, pg: int) -> Dict[str, Any]:
+        """Latest package of an extension package on os / pg, or the reason there is none."""
+        key = (pkg, os_name, pg)
+        if key not in self.package_memo:
+            self.package_memo[key] = self._resolve_package(pkg, os_name, pg)
+        return dict(self.package_memo[key])
+
+    def _resolve_package(self, pkg: str, os_name: str, pg: int) -> Dict[str, Any]:
+        entry = self.matrix.get((pkg, os_name, pg))
+        if entry is None:
+            return {'pkg': pkg, 'reason': 'not in matrix'}
+        if entry.get('hide'):
+            return {'pkg': pkg, 'pname': entry['pname'], 'reason': 'hidden'}
+        candidates = self.packages.get((pkg, os_name, pg, entry['pname']))
+        if not candidates:
+            return {'pkg': pkg, 'pname': entry['pname'], 'reason': 'no package'}
+        best = max(candidates, key=lambda p: package_order(p['ver']))
+        return {
+            'pkg': pkg, 'name': best['name'], 'ver': best['ver'], 'repo': self.package_repo(best),
+            'file': best['file'], 'url': best['url'], 'sha256': best['sha256'], 'size': best['size'],
+        }
+
+    def _resolve(self, names: Tuple[str, ...], os_name: str, pg: int) -> Dict[str, Tuple]:
+        key = (names, os_name, pg)
+        if key not in self.plan_memo:
+            self.plan_memo[key] = self._build_plan(names, os_name, pg)
+        return self.plan_memo[key]
+
+    def _build_plan(self, names: Tuple[str, ...], os_name: str, pg: int) -> Dict[str, Tuple]:
+        """Plan parts of a sorted tuple of extension names, as tuples: they are shared through the memo."""
+        known = [name for name in names if name in self.graph]
+        unknown = [name for name in names if name not in self.graph]
+        install = self.graph.install_order(known)
+        packages, contrib, external, missing, by_pkg = [], [], [], [], {}
+        for name in install:
+            ext = self.extensions.get(name)
+            if ext is None:  # required by another extension, but not in extension.csv
+                unknown.append(name)
+                continue
+            deps = ext.rpm_deps if self.platforms[os_name] == 'rpm' else ext.deb_deps
+            for template in deps:
+                dep = template.replace('$v', str(pg))
+                if template in self.graph.external.get(name, ()) and dep not in external:
+                    external.append(dep)
+            if ext.contrib:
+                contrib.append(name)
+                continue
+            if ext.pkg in by_pkg:
+                by_pkg[ext.pkg]['extensions'].append(name)
+                continue
+            resolved = self.resolve_package(ext.pkg, os_name, pg)
+            item = dict(resolved, extensions=[name])
+            by_pkg[ext.pkg] = item
+            (missing if 'reason' in resolved else packages).append(item)
+        for item in by_pkg.values():
+            item['extensions'] = tuple(item['extensions'])
+        return {
+            'install': tuple(install), 'packages': tuple(packages), 'contrib': tuple(contrib),
+            'external': tuple(external), 'missing': tuple(missing), 'unknown': tuple(unknown),
+        }
+
+    def resolve(self, extensions: Iterable[str], os_name: str, pg: int) -> Dict[str, Any]:
+        """Install plan of extensions on a platform like el9.x86_64 for a PG major."""
+        if os_name not in self.platforms:
+            raise ValueError(f"unknown os {os_name!r}, expect one of {', '.join(sorted(self.platforms))}")
+        extensions = list(extensions)
+        plan = {'os': os_name, 'pg': pg, 'extensions': extensions}
+        for key, value in self._resolve(tuple(sorted(set(extensions))), os_name, pg).items():
+            plan[key] = [dict(item) if isinstance(item, dict) else item for item in value]  # copies, the memo is shared
+        return plan
+
+    def resolve_spec(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve one {"id", "os", "pg", "extensions"} spec, errors are reported in the plan."""
+        if not isinstance(spec, dict):
+            return {'error': "spec must be an object"}
+        head = {'id': spec['id']} if 'id' in spec else {}
+        try:
+            extensions = spec.get('extensions') or []
+            if isinstance(extensions, str):
+                extensions = extensions.replace(',', ' ').split()
+            return dict(head, **self.resolve(extensions, spec['os'], int(spec['pg'])))
+        except KeyError as e:
+            return dict(head, error=f"missing field {e}")
+        except (TypeError, ValueError) as e:
+            return dict(head, error=str(e))
+
+    def resolve_all(self, specs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for spec in specs:
+            yield self.resolve_spec(spec)
+
+
+def read_specs(paths: List[str]) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """JSON lines specs from files, or stdin for '-', as (spec, None) or (None, error entry) pairs."""
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+        with f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    spec = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield None, {'id': f'{path}:{lineno}', 'error': f"invalid json: {e}"}
+                    continue
+                if not isinstance(spec, dict):
+                    yield None, {'id': f'{path}:{lineno}', 'error': "spec must be an object"}
+                    continue
+                yield spec, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve extension install plans into RPM / DEB packages")
+    parser.add_argument('specs', nargs='*', help="JSON lines spec files, '-' for stdin (default)")
+    parser.add_argument('-e', '--ext', action='append', default=[], help="extension to resolve, repeatable")
+    parser.add_argument('--os', help="platform of --ext, e.g. el9.x86_64")
+    parser.add_argument('--pg', type=int, help="PG major version of --ext")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    resolver = PlanResolver()
+    loaded = time.perf_counter()
+
+    if args.ext:
+        if not args.os or not args.pg:
+            parser.error("--ext requires --os and --pg")
+        specs = [({'os': args.os, 'pg': args.pg, 'extensions': args.ext}, None)]
+    else:
+        specs = read_specs(args.specs or ['-'])
+
+    count = errors = 0
+    out = sys.stdout
+    for spec, parse_error in specs:
+        plan = parse_error or resolver.resolve_spec(spec)
+        out.write(json.dumps(plan, ensure_ascii=False, separators=(',', ':')) + '\n')
+        count += 1
+        errors += 'error' in plan
+    done = time.perf_counter()
+    print(f"Resolved {count} specs ({errors} errors) in {(done - loaded) * 1000:.1f} ms, "
+          f"indexes loaded in {(loaded - start) * 1000:.1f} ms", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+"""
+Tests for the package lookup of gen-list.py: the availability grid built from PackageIndex
+must match a linear scan of all packages against the extension's rpm_pkg / deb_pkg templates.
+
+    python -m unittest bin/test_gen_list.py
+"""
+
+import os
+import copy
+import fnmatch
+import unittest
+import importlib.util
+from dataclasses import fields
+
+
+def load_gen_list():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gen-list.py')
+    spec = importlib.util.spec_from_file_location('gen_list', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# (os, package name, pname as computed by pgext.reload_package, org), for PG 17 and 16
+PACKAGES = [
+    ('el9.x86_64', 'postgresql{pg}-contrib', 'po', 'pgdg'),
+    ('d12.x86_64', 'postgresql-{pg}', 'postgresql-{pg}', 'pgdg'),
+    ('el9.x86_64', 'pgpool-II-pg{pg}-extensions', 'pg', 'pgdg'),
+    ('d12.x86_64', 'postgresql-{pg}-pgpool2', 'postgresql-{pg}-pgpool2', 'pgdg'),
+    ('el9.aarch64', 'dbt2-pg{pg}-extensions', 'db', 'pgdg'),
+    ('el9.x86_64', 'percona-postgresql{pg}-server', 'pe', 'pigsty'),
+    ('el9.x86_64', 'timescaledb-2-postgresql-{pg}', 'ti', 'pgdg'),
+    ('el9.x86_64', 'timescaledb-tsl_{pg}', 'timescaledb-tsl_{pg}', 'pigsty'),
+    ('u24.x86_64', 'postgresql-{pg}-timescaledb-tsl', 'postgresql-{pg}-timescaledb-tsl', 'pigsty'),
+    ('el9.x86_64', 'pg_cron_{pg}', 'pg_cron_{pg}', 'pgdg'),
+    ('el9.x86_64', 'pg_cron_{pg}-llvmjit', 'pg_cron_{pg}', 'pgdg'),
+    ('u22.x86_64', 'postgresql-{pg}-cron-dbgsym', 'postgresql-{pg}-cron', 'pgdg'),
+]
+
+# extension name -> (pkg, rpm_pkg, deb_pkg, contrib)
+EXTENSIONS = {
+    'cube': ('cube', 'postgresql$v-contrib', 'postgresql-$v', True),
+    'pgpool_adm': ('pgpool', 'pgpool-II-pg$v-extensions', 'postgresql-$v-pgpool2', False),
+    'dbt2': ('dbt2', 'dbt2-pg$v-extensions*', None, False),
+    'pg_tde': ('pg_tde', 'percona-postgresql$v*', 'percona-postgresql-$v', False),
+    'timescaledb': ('timescaledb', 'timescaledb-tsl_$v*', 'postgresql-$v-timescaledb-tsl', False),
+    'pg_cron': ('pg_cron', 'pg_cron_$v*', 'postgresql-$v-cron', False),
+}
+
+
+class PackageIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.gl = load_gen_list()
+        cls.config = cls.gl.Config()
+        packages = []
+        for os_name in cls.config.OS_VERSIONS:
+            for pg in (17, 16):
+                for pkg_os, name, pname, org in PACKAGES:
+                    if pkg_os != os_name:
+                        continue
+                    os_code, os_arch = os_name.split('.')
+                    name, pname = name.format(pg=pg), pname.format(pg=pg)
+                    packages.append(cls.gl.Package(
+                        pg=pg, os=os_name, pname=pname, org=org, type='rpm' if os_code.startswith('el') else 'deb',
+                        os_code=os_code, os_arch=os_arch, repo=org, name=name, ver='1.0-1', version='1.0',
+                        release='1', file=f'{name}.pkg', sha256='', url='', mirror_url='', size=0, size_full=0))
+        cls.packages = packages
+
+    def make_extension(self, name: str):
+        pkg, rpm_pkg, deb_pkg, contrib = EXTENSIONS[name]
+        values = {f.name: None for f in fields(self.gl.Extension)}
+        values.update(name=name, pkg=pkg, rpm_pkg=rpm_pkg, deb_pkg=deb_pkg, contrib=contrib, pg_ver=['17', '16'])
+        return self.gl.Extension(**values)
+
+    def linear_packages(self, ext):
+        """Baseline: scan every package against each template with $v substituted."""
+        patterns = []
+        for spec in (ext.rpm_pkg, ext.deb_pkg):
+            if spec:
+                patterns.extend(spec.split(' ')[0].replace('$v', str(pg)) for pg in (18, 17, 16, 15, 14, 13))
+        return [pkg for pkg in self.packages
+                if any(fnmatch.fnmatchcase(pkg.name, p) or fnmatch.fnmatchcase(pkg.pname, p) for p in patterns)]
+
+    def grid(self, ext, packages):
+        ext = copy.copy(ext)
+        ext.packages = packages
+        return self.gl.TableGenerator({}).generate_availability_matrix(ext, self.config)
+
+    def test_grid_matches_linear_scan(self):
+        index = self.gl.PackageIndex(self.packages)
+        for name in EXTENSIONS:
+            with self.subTest(extension=name):
+                ext = self.make_extension(name)
+                ext.load_packages(index)
+                baseline = self.linear_packages(ext)
+                self.assertTrue(baseline)
+                self.assertEqual([p.file + p.os for p in ext.packages], [p.file + p.os for p in baseline])
+                self.assertEqual(self.grid(ext, ext.packages), self.grid(ext, baseline))
+                self.assertRegex(self.grid(ext, ext.packages), r'variant="(blue|amber)-subtle">17<')
+
+    def test_template_packages_found(self):
+        index = self.gl.PackageIndex(self.packages)
+        expect = {
+            'cube': {'postgresql17-contrib', 'postgresql-17'},
+            'pgpool_adm': {'pgpool-II-pg17-extensions', 'postgresql-17-pgpool2'},
+            'dbt2': {'dbt2-pg17-extensions'},
+            'pg_tde': {'percona-postgresql17-server'},
+            'timescaledb': {'timescaledb-tsl_17', 'postgresql-17-timescaledb-tsl'},
+            'pg_cron': {'pg_cron_17', 'pg_cron_17-llvmjit', 'postgresql-17-cron-dbgsym'},
+        }
+        for name, names in expect.items():
+            with self.subTest(extension=name):
+                ext = self.make_extension(name)
+                ext.load_packages(index)
+                self.assertEqual({p.name for p in ext.packages if p.pg == 17}, names)
+
+    def test_rpm_name_with_dashes_not_taken_as_deb(self):
+        index = self.gl.PackageIndex(self.packages)
+        found = {p.name for p in index.lookup('postgresql-$v-timescaledb-tsl', 'timescaledb-tsl_$v*')}
+        self.assertNotIn('timescaledb-2-postgresql-17', found)
+
+
+if __name__ == '__main__':
+    unittest.main()
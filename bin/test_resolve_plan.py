@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Tests for resolve-plan.py: version ordering keys, and the errors a spec or spec file can report.
+
+    python -m unittest bin/test_resolve_plan.py
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import contextlib
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common_utils import Config, Dataset
+
+
+def load_resolve_plan():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resolve-plan.py')
+    spec = importlib.util.spec_from_file_location('resolve_plan', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+rp = load_resolve_plan()
+
+
+class VersionOrderTest(unittest.TestCase):
+
+    def assertOrdered(self, *versions):
+        """Each (version, release) pair sorts strictly before the next one."""
+        keys = [rp.version_key(version, release) for version, release in versions]
+        for (lower, higher), pair in zip(zip(keys, keys[1:]), zip(versions, versions[1:])):
+            self.assertLess(lower, higher, pair)
+
+    def test_numeric_segments(self):
+        self.assertOrdered(('1.2', None), ('1.9', None), ('1.10', None), ('2.0', None))
+        self.assertEqual(rp.version_key('1.02'), rp.version_key('1.2'))
+
+    def test_epoch(self):
+        self.assertOrdered(('9.9', None), ('1:0.1', None), ('2:0.1', None), ('10:0.1', None))
+        self.assertEqual(rp.version_key('0:1.0'), rp.version_key('1.0'))
+
+    def test_tilde_sorts_before_release(self):
+        self.assertOrdered(('1.0~beta1', None), ('1.0~rc1', None), ('1.0', None), ('1.0.1', None))
+
+    def test_release(self):
+        self.assertOrdered(('1.0', '1'), ('1.0', '2'), ('1.0', '10'), ('1.1', '1'))
+        self.assertOrdered(('1.0', '1PGDG.rhel9'), ('1.0', '2PGDG.rhel9'))
+
+    def test_package_order(self):
+        vers = ['1.0-2', '1:1.0-1', '1.0~rc1-1', '1.0-10', '0.9.9-1', '1.0-1']
+        self.assertEqual(sorted(vers, key=rp.package_order),
+                         ['0.9.9-1', '1.0~rc1-1', '1.0-1', '1.0-2', '1.0-10', '1:1.0-1'])
+
+    def test_package_order_semver_first(self):
+        # as pgext.availability: the normalized major.minor.patch decides, the full key breaks ties
+        self.assertLess(rp.package_order('1:0.5-1'), rp.package_order('0.9.9-1'))
+
+
+class ResolveSpecErrorTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.resolver = rp.PlanResolver(Dataset(Config(), use_cache=False))
+        cls.os_name = sorted(cls.resolver.platforms)[0]
+
+    def test_not_an_object(self):
+        self.assertEqual(self.resolver.resolve_spec([1, 2]), {'error': 'spec must be an object'})
+        self.assertEqual(self.resolver.resolve_spec('x'), {'error': 'spec must be an object'})
+
+    def test_missing_field(self):
+        plan = self.resolver.resolve_spec({'id': 'a', 'pg': 17, 'extensions': ['vector']})
+        self.assertEqual(plan, {'id': 'a', 'error': "missing field 'os'"})
+
+    def test_invalid_values(self):
+        plan = self.resolver.resolve_spec({'id': 'b', 'os': 'nowhere.x86_64', 'pg': 17, 'extensions': []})
+        self.assertEqual(plan['id'], 'b')
+        self.assertIn('unknown os', plan['error'])
+        plan = self.resolver.resolve_spec({'os': self.os_name, 'pg': 'latest', 'extensions': []})
+        self.assertIn('error', plan)
+
+    def test_read_specs_errors(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write('[1, 2]\n\n"x"\nnot json\n{"id": "c", "error": "kept", "os": "el9.x86_64", "pg": 17}\n')
+        try:
+            entries = list(rp.read_specs([f.name]))
+        finally:
+            os.unlink(f.name)
+        self.assertEqual([spec for spec, _ in entries], [None, None, None,
+                                                         {'id': 'c', 'error': 'kept', 'os': 'el9.x86_64', 'pg': 17}])
+        errors = [error for _, error in entries]
+        self.assertEqual([e and e['id'] for e in errors], [f'{f.name}:1', f'{f.name}:3', f'{f.name}:4', None])
+        self.assertEqual(errors[0]['error'], 'spec must be an object')
+        self.assertTrue(errors[2]['error'].startswith('invalid json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -100,6 +100,20 @@ COMMENT ON COLUMN pgext.repo_data.data IS 'the repo binary data, used for yum/ap
 COMMENT ON COLUMN pgext.repo_data.last_modified IS 'last modified time of the repo data file';
 COMMENT ON COLUMN pgext.repo_data.update_at IS 'the last modified time of this record';
 
+-- DROP TABLE IF EXISTS pgext.repo_parsed;
+CREATE TABLE IF NOT EXISTS pgext.repo_parsed
+(
+    repo         TEXT PRIMARY KEY, -- REFERENCES pgext.repo_data(id),
+    checksum     TEXT,   -- repo_data checksum (or etag, or md5 of data) that was parsed into yum / apt
+    rows         BIGINT, -- number of packages loaded from this repo
+    parse_at     TIMESTAMPTZ DEFAULT now() -- when this repo was last parsed
+);
+
+COMMENT ON TABLE  pgext.repo_parsed IS 'the parsed state of each repo in pgext.yum / pgext.apt';
+COMMENT ON COLUMN pgext.repo_parsed.checksum IS 'extra.checksum, etag or md5:<data md5> of the parsed repo_data, reparse when changed';
+COMMENT ON COLUMN pgext.repo_parsed.rows IS 'number of packages loaded from this repo';
+COMMENT ON COLUMN pgext.repo_parsed.parse_at IS 'when this repo was last parsed';
+
 -- COPY pgext.repo_data TO '/Users/vonng/pgsty/ext/data/repo_data.csv' CSV HEADER;
 -- TRUNCATE pgext.repo_data CASCADE; COPY pgext.repository FROM '/Users/vonng/pgsty/ext/data/repo_data.csv' CSV HEADER;
 
@@ -260,11 +274,15 @@ BEGIN
             SELECT pkg, ext,'rpm' AS type, pg, os, os_code, os_arch, replace( (regexp_split_to_array(rpm, ' '))[1], '$v', pg::text) AS pname FROM packages, unnest(ARRAY[18,17,16,15,14,13]) AS pg, (SELECT distinct os, type, os_code, os_arch FROM pgext.repository WHERE type = 'rpm' ORDER BY os) r
         ) d ORDER BY pg DESC, type, os;
     UPDATE pgext.matrix SET pname = replace(pname, 'pgaudit', 'pgaudit' || (pg+2)::TEXT ) WHERE pkg = 'pgaudit' AND pg IN (13,14,15) AND type = 'rpm';
+    -- pgext.availability is materialized over matrix & package, keep it in step with the new matrix
+    IF to_regclass('pgext.availability') IS NOT NULL THEN
+        PERFORM pgext.refresh_availability();
+    END IF;
     RETURN (SELECT count(*) FROM pgext.matrix);
 END;
 $$ LANGUAGE PlPGSQL VOLATILE;
 
-COMMENT ON FUNCTION pgext.init_matrix() IS 'init extension package matrix data';
+COMMENT ON FUNCTION pgext.init_matrix() IS 'init extension package matrix data, and refresh availability';
 
 SELECT pgext.init_matrix();
 
@@ -365,6 +383,48 @@ BEGIN
                 ], '.');
 END; $$ LANGUAGE plpgsql IMMUTABLE;
 
+-- normalized version as SEMVER, NULL if it can not be parsed, so one odd upstream version never aborts a reload
+CREATE OR REPLACE FUNCTION pgext.semver_or_null(version text) RETURNS SEMVER AS $$
+BEGIN
+    RETURN pgext.normalize_version(version)::SEMVER;
+EXCEPTION WHEN OTHERS THEN
+    RETURN NULL;
+END; $$ LANGUAGE plpgsql IMMUTABLE;
+
+
+-- Debian / RPM aware version ordering key, compare with COLLATE "C"
+-- the epoch (deb N: prefix), then version and release segments are encoded as:
+--   ~ -> A, end of version / release -> B, letters -> C<letters>. , digits -> D<length><digits>
+-- so 1.0~rc1 < 1.0 < 1.0a < 1.0.1, and 1.9 < 1.10
+CREATE OR REPLACE FUNCTION pgext.version_key(version TEXT, release TEXT DEFAULT NULL) RETURNS TEXT AS $$
+DECLARE
+    key   TEXT;
+    epoch TEXT := '0';
+    part  TEXT;
+    tok   TEXT;
+BEGIN
+    IF version ~ '^\d+:' THEN
+        epoch := substring(version from '^(\d+):');
+        version := substring(version from ':(.*)$');
+    END IF;
+    epoch := coalesce(nullif(ltrim(epoch, '0'), ''), '0');
+    key := 'D' || chr(64 + length(epoch)) || epoch;
+    FOREACH part IN ARRAY ARRAY[coalesce(version, ''), coalesce(release, '')] LOOP
+        FOR tok IN SELECT m[1] FROM regexp_matches(part, '(~|\d+|[A-Za-z]+)', 'g') AS m LOOP
+            IF tok = '~' THEN
+                key := key || 'A';
+            ELSIF tok ~ '^\d' THEN
+                tok := coalesce(nullif(ltrim(tok, '0'), ''), '0');
+                key := key || 'D' || chr(64 + length(tok)) || tok;
+            ELSE
+                key := key || 'C' || tok || '.';
+            END IF;
+        END LOOP;
+        key := key || 'B';
+    END LOOP;
+    RETURN key;
+END; $$ LANGUAGE plpgsql IMMUTABLE;
+
 
 -----------------------------------
 -- RPM / DEB Merged Package Table
@@ -389,187 +449,129 @@ CREATE TABLE IF NOT EXISTS pgext.package
     url        TEXT,
     mirror_url TEXT,
     size       integer,
-    size_full  integer
+    size_full  integer,
+    semver     SEMVER GENERATED ALWAYS AS (pgext.semver_or_null(version)) STORED, -- normalized version, NULL if unparsable
+    vkey       TEXT COLLATE "C" GENERATED ALWAYS AS (pgext.version_key(version, release)) STORED -- full version order
 );
 
+-- migrate a package table created before the version sort columns
+ALTER TABLE pgext.package ADD COLUMN IF NOT EXISTS semver SEMVER GENERATED ALWAYS AS (pgext.semver_or_null(version)) STORED;
+ALTER TABLE pgext.package ADD COLUMN IF NOT EXISTS vkey TEXT COLLATE "C" GENERATED ALWAYS AS (pgext.version_key(version, release)) STORED;
+
 CREATE INDEX IF NOT EXISTS package_os_pname_idx ON pgext.package USING BTREE(os,pname);
+CREATE INDEX IF NOT EXISTS package_os_name_version_idx ON pgext.package USING BTREE(os, name, semver DESC NULLS LAST, vkey DESC);
+-- one row per file of a repo, keeps the availability key (pkg, os, pg, repo, file) unique for REFRESH CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS package_os_repo_file_idx ON pgext.package USING BTREE(os, repo, file);
 
 
 -- if the yum / apt packages changed, you can reload the package table
-CREATE OR REPLACE FUNCTION pgext.reload_package() RETURNS BIGINT AS $$
+-- pass the changed repo ids to only reload packages of those repos, NULL reloads all
+-- each source table is scanned once, the pg major is derived by joining pgext.pg_major:
+--   rpm: name contains _<pg> or <pg>-, pname is the name up to _<pg>
+--   deb: package contains -<pg>, pname strips -scripts/-doc/-dbgsym suffixes and maps -pgq-node to -pgq
+-- a file listed twice by a repo, or matching more than one pg major, is kept once (the highest pg)
+DROP FUNCTION IF EXISTS pgext.reload_package();
+CREATE OR REPLACE FUNCTION pgext.reload_package(repos TEXT[] DEFAULT NULL) RETURNS BIGINT AS $$
 DECLARE
 BEGIN
-    TRUNCATE pgext.package;
+    IF repos IS NULL THEN
+        TRUNCATE pgext.package;
+    ELSE
+        DELETE FROM pgext.package WHERE repo = ANY (repos);
+    END IF;
     INSERT INTO pgext.package
-    SELECT pg, os, pname, org, type, os_code, os_arch,  repo, name, ver, version, release, file, d.sha256,url, mirror_url, size, size_full
+    SELECT * FROM (
+    SELECT DISTINCT ON (os, repo, file) pg, os, pname, org, type, os_code, os_arch, repo, name, ver, version, release, file, sha256, url, mirror_url, size, size_full
     FROM
         (
-            SELECT 18 as pg, r.os, substr(name, 0, position('_18' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_18' in name) > 0 OR position('18-' in name) > 0
-            UNION ALL
-            SELECT 17 as pg, r.os, substr(name, 0, position('_17' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_17' in name) > 0 OR position('17-' in name) > 0
-            UNION ALL
-            SELECT 16 as pg, r.os, substr(name, 0, position('_16' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_16' in name) > 0 OR position('16-' in name) > 0
-            UNION ALL
-            SELECT 15 as pg, r.os, substr(name, 0, position('_15' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_15' in name) > 0 OR position('15-' in name) > 0
+            SELECT pm.pg, r.os, substr(y.name, 0, position('_' || pm.pg::TEXT in y.name) + 3) AS pname, r.org, r.type, r.os_code, r.os_arch, y.pkg_id AS sha256,
+                   y.repo, y.name, y.version || '-' || y.release AS ver, y.version, y.release, regexp_replace(y.location_href, '^.*/', '') AS file,
+                   format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, y.size_package AS size, y.size_installed AS size_full
+            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id
+                 JOIN pgext.pg_major pm ON position('_' || pm.pg::TEXT in y.name) > 0 OR position(pm.pg::TEXT || '-' in y.name) > 0
+            WHERE repos IS NULL OR y.repo = ANY (repos)
             UNION ALL
-            SELECT 14 as pg, r.os, substr(name, 0, position('_14' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_14' in name) > 0 OR position('14-' in name) > 0
-            UNION ALL
-            SELECT 13 as pg, r.os, substr(name, 0, position('_13' in name)+3) AS pname, r.org,r.type,r.os_code,r.os_arch,pkg_id AS sha256,
-                   repo, name, version || '-' || release AS ver, version, release, regexp_replace(y.location_href, '^.*/', '') AS file, format('%s/%s', r.default_url, y.location_href) AS url, format('%s/%s', r.mirror_url, y.location_href) AS mirror_url, size_package AS size, size_installed AS size_full
-            FROM pgext.yum y JOIN pgext.repository r ON y.repo = r.id WHERE position('_13' in name) > 0 OR position('13-' in name) > 0
-        ) d
-    UNION ALL
-    SELECT pg, os, pname, org, type, os_code, os_arch, repo, name, ver, version, release, file, sha256, url, mirror_url, size, size_full
-    FROM
-        (
-            SELECT 17 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-17' in package) > 0 UNION ALL
-            SELECT 18 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-18' in package) > 0 UNION ALL
-            SELECT 16 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-16' in package) > 0 UNION ALL
-            SELECT 15 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-15' in package) > 0 UNION ALL
-            SELECT 14 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-14' in package) > 0 UNION ALL
-            SELECT 13 AS pg, r.os, regexp_replace(regexp_replace(regexp_replace(regexp_replace(package, '-scripts$', ''), '-doc$', ''), '-dbgsym$', ''), '-pgq-node$', '-pgq') AS pname, r.org,r.type,r.os_code,r.os_arch,package as name, repo, version as ver, coalesce(((regexp_match(version, '^(.*)-([^-]+)$'))[1]),version) AS version, (regexp_match(version, '^(.*)-([^-]+)$'))[2] AS release,sha256,
-                   regexp_replace(a.filename, '^.*/', '') AS file, format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, size, size_install AS size_full FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id WHERE position('-13' in package) > 0
+            SELECT pm.pg, r.os, regexp_replace(a.package, '(-pgq)-node(-dbgsym)?(-doc)?(-scripts)?$|(-dbgsym)?(-doc)?(-scripts)?$', '\1') AS pname, r.org, r.type, r.os_code, r.os_arch, a.sha256,
+                   a.repo, a.package AS name, a.version AS ver, coalesce(v.part[1], a.version) AS version, v.part[2] AS release, regexp_replace(a.filename, '^.*/', '') AS file,
+                   format('%s/%s', r.default_url, a.filename) AS url, format('%s/%s', r.mirror_url, a.filename) AS mirror_url, a.size, a.size_install AS size_full
+            FROM pgext.apt a JOIN pgext.repository r ON a.repo = r.id
+                 CROSS JOIN LATERAL regexp_match(a.version, '^(.*)-([^-]+)$') AS v(part)
+                 JOIN pgext.pg_major pm ON position('-' || pm.pg::TEXT in a.package) > 0
+            WHERE repos IS NULL OR a.repo = ANY (repos)
         ) d
-    ORDER BY pg, os, pname, name, org, ver;
+    ORDER BY os, repo, file, pg DESC
+    ) u ORDER BY pg, os, pname, name, org, ver;
+    PERFORM pgext.refresh_availability();
     RETURN (SELECT count(*) FROM pgext.package);
 END;
 $$ LANGUAGE PlPGSQL VOLATILE;
 
-COMMENT ON FUNCTION pgext.reload_package() IS 'reload apt/yum package, return the count of packages';
+COMMENT ON FUNCTION pgext.reload_package(TEXT[]) IS 'reload apt/yum package (of given repos), return the count of packages';
 
 
 -----------------------------------
 -- Availability View
 -----------------------------------
-DROP VIEW IF EXISTS pgext.availability CASCADE;
-CREATE OR REPLACE VIEW pgext.availability AS
-SELECT pkg, ext, pname, os, pg, name, ver, org, type, os_code, os_arch, repo, version, release, file, sha256, url, mirror_url, size, size_full
-FROM
-    (
-        SELECT m.pkg, m.ext, m.pg, m.os, name, ver, m.type, m.os_code, m.os_arch, m.pname, org, repo, version, release, file,sha256, url, mirror_url, size, size_full
-        FROM pgext.matrix m JOIN pgext.package p ON m.os = p.os AND m.pname = p.name
-    ) pa
-ORDER BY pkg, pname, os, pgext.normalize_version(version)::SEMVER DESC, ver DESC, org DESC;
-
--- SELECT * FROM ext.availability WHERE pkg = 'pgvector';
-
-
------------------------------------
--- Update Matrix Statistics
------------------------------------
-CREATE OR REPLACE FUNCTION pgext.update_matrix() RETURNS BIGINT AS $$
-DECLARE
-    updated_count BIGINT;
+-- materialized with a precomputed semver sort key, refreshed by pgext.refresh_availability()
+-- init_matrix() and reload_package() refresh it; anything else that writes matrix rows or package must call it
+-- rows are unordered, sort by: pkg, pname, os, semver DESC NULLS LAST, vkey DESC, org DESC
+-- older installs have a plain view here, drop whichever kind exists; nothing in this schema depends on it,
+-- and its indexes / refresh function are recreated below
+DO $$
 BEGIN
-    -- Single UPDATE statement that combines all three operations:
-    -- 1. Calculate count from availability
-    -- 2. Get the latest package info (pkg_repo, pkg_ver)
-    -- 3. Handle NULL cases
-    WITH availability_stats AS (
-        SELECT 
-            m.pg, m.os, m.pkg, m.pname,
-            COUNT(a.pkg) as pkg_count,
-            FIRST_VALUE(a.org) OVER (
-                PARTITION BY m.pg, m.os, m.pkg, m.pname 
-                ORDER BY pgext.normalize_version(a.version)::SEMVER DESC, a.ver DESC, a.org DESC
-            ) as latest_repo,
-            FIRST_VALUE(a.version) OVER (
-                PARTITION BY m.pg, m.os, m.pkg, m.pname 
-                ORDER BY pgext.normalize_version(a.version)::SEMVER DESC, a.ver DESC, a.org DESC
-            ) as latest_version
-        FROM pgext.matrix m
-        LEFT JOIN pgext.availability a ON (
-            a.pkg = m.pkg AND a.pg = m.pg AND a.os = m.os
-        )
-        GROUP BY m.pg, m.os, m.pkg, m.pname, a.org, a.version, a.ver
-    ),
-    aggregated_stats AS (
-        SELECT 
-            pg, os, pkg, pname,
-            SUM(pkg_count) as total_count,
-            FIRST_VALUE(latest_repo) OVER (
-                PARTITION BY pg, os, pkg, pname 
-                ORDER BY latest_version DESC NULLS LAST
-            ) as final_repo,
-            FIRST_VALUE(latest_version) OVER (
-                PARTITION BY pg, os, pkg, pname 
-                ORDER BY latest_version DESC NULLS LAST
-            ) as final_version
-        FROM availability_stats
-        GROUP BY pg, os, pkg, pname, latest_repo, latest_version
-    ),
-    final_stats AS (
-        SELECT DISTINCT ON (pg, os, pkg, pname)
-            pg, os, pkg, pname,
-            total_count,
-            final_repo,
-            final_version
-        FROM aggregated_stats
-        ORDER BY pg, os, pkg, pname
-    )
-    UPDATE pgext.matrix 
-    SET 
-        count = COALESCE(fs.total_count, 0),
-        pkg_repo = fs.final_repo,
-        pkg_ver = fs.final_version
-    FROM final_stats fs
-    WHERE matrix.pg = fs.pg 
-      AND matrix.os = fs.os 
-      AND matrix.pkg = fs.pkg 
-      AND matrix.pname = fs.pname;
-
-    -- Handle any remaining NULL cases (fallback)
-    UPDATE pgext.matrix 
-    SET count = 0, pkg_repo = NULL, pkg_ver = NULL 
-    WHERE count IS NULL;
-
-    RETURN updated_count;
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('pgext.availability') AND relkind = 'v') THEN
+        DROP VIEW pgext.availability CASCADE;
+    END IF;
+END $$;
+DROP MATERIALIZED VIEW IF EXISTS pgext.availability CASCADE;
+CREATE MATERIALIZED VIEW pgext.availability AS
+SELECT m.pkg, m.ext, m.pname, m.os, m.pg, p.name, p.ver, p.org, m.type, m.os_code, m.os_arch, p.repo, p.version, p.release, p.file, p.sha256, p.url, p.mirror_url, p.size, p.size_full,
+       p.semver, p.vkey
+FROM pgext.matrix m JOIN pgext.package p ON m.os = p.os AND m.pname = p.name;
+
+-- unique index is required by REFRESH CONCURRENTLY, it also serves (pkg, os, pg) lookups
+CREATE UNIQUE INDEX IF NOT EXISTS availability_pkg_os_pg_repo_file_idx ON pgext.availability (pkg, os, pg, repo, file);
+CREATE INDEX IF NOT EXISTS availability_pkg_pname_os_idx ON pgext.availability (pkg, pname, os, semver DESC NULLS LAST, vkey DESC, org DESC);
+
+CREATE OR REPLACE FUNCTION pgext.refresh_availability() RETURNS BIGINT AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY pgext.availability;
+    RETURN (SELECT count(*) FROM pgext.availability);
 END;
 $$ LANGUAGE PlPGSQL VOLATILE;
 
-COMMENT ON FUNCTION pgext.update_matrix() IS 'Update matrix table with package counts and latest version info';
+COMMENT ON FUNCTION pgext.refresh_availability() IS 'refresh availability without blocking readers, return the count of rows';
 
+-- SELECT * FROM ext.availability WHERE pkg = 'pgvector';
 
 
 -----------------------------------
 -- Update Matrix Statistics
 -----------------------------------
-CREATE OR REPLACE FUNCTION pgext.update_matrix() RETURNS BIGINT AS $$
+-- pass the affected os list to only update those slices, NULL updates all
+-- the columns written here (count, pkg_repo, pkg_ver, miss) are not in pgext.availability, no refresh needed
+DROP FUNCTION IF EXISTS pgext.update_matrix();
+CREATE OR REPLACE FUNCTION pgext.update_matrix(oses TEXT[] DEFAULT NULL) RETURNS BIGINT AS $$
+DECLARE
+    updated BIGINT;
 BEGIN
-    UPDATE pgext.matrix SET count = (SELECT COUNT(*) FROM pgext.availability
-        WHERE availability.pkg = matrix.pkg
-          AND availability.pg = matrix.pg
-          AND availability.os = matrix.os
-    );
-
-    WITH latest_packages AS (
-        SELECT DISTINCT ON (pkg, pname, os) pkg, pname, os, pg, org as pkg_repo, version as pkg_ver FROM pgext.availability
-        ORDER BY pkg, pname, os, pgext.normalize_version(version)::SEMVER DESC, ver DESC, org DESC
-    ) UPDATE pgext.matrix SET pkg_repo = lp.pkg_repo, pkg_ver = lp.pkg_ver
-    FROM latest_packages lp WHERE matrix.pkg = lp.pkg AND matrix.pname = lp.pname AND matrix.os = lp.os AND matrix.pg = lp.pg;
-
-    UPDATE pgext.matrix SET count = 0, pkg_repo = NULL, pkg_ver = NULL WHERE count IS NULL;
-    UPDATE pgext.matrix SET miss = true WHERE count = 0 OR count IS NULL;
-    UPDATE pgext.matrix SET miss = false WHERE count > 0;
-    RETURN (SELECT count(*) FROM pgext.matrix);
+    -- one grouped pass over matrix & package: count, latest repo & version, miss flag per (pg, os, pkg)
+    -- only rows whose values actually changed are written
+    WITH stats AS (
+        SELECT m.pg, m.os, m.pkg, count(p.name) AS count,
+               (array_agg(p.org ORDER BY p.semver DESC NULLS LAST, p.vkey DESC, p.org DESC))[1] AS pkg_repo,
+               (array_agg(p.version ORDER BY p.semver DESC NULLS LAST, p.vkey DESC, p.org DESC))[1] AS pkg_ver
+        FROM pgext.matrix m LEFT JOIN pgext.package p ON p.os = m.os AND p.name = m.pname
+        WHERE oses IS NULL OR m.os = ANY (oses)
+        GROUP BY m.pg, m.os, m.pkg
+    ) UPDATE pgext.matrix SET count = s.count, pkg_repo = s.pkg_repo, pkg_ver = s.pkg_ver, miss = s.count = 0
+    FROM stats s WHERE matrix.pg = s.pg AND matrix.os = s.os AND matrix.pkg = s.pkg
+      AND (matrix.count, matrix.pkg_repo, matrix.pkg_ver, matrix.miss) IS DISTINCT FROM (s.count, s.pkg_repo, s.pkg_ver, s.count = 0);
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
 END;
 $$ LANGUAGE PlPGSQL VOLATILE;
-COMMENT ON FUNCTION pgext.update_matrix() IS 'Update matrix table with package counts and latest version info';
+COMMENT ON FUNCTION pgext.update_matrix(TEXT[]) IS 'Update matrix table (of given os) with package counts and latest version info, return changed rows';
 
 
 